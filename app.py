@@ -1,23 +1,72 @@
+from flask import Flask, Response, g, has_request_context, render_template, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import requests
 import re
+import os
+import sys
+import random
+import fcntl
+import functools
+import hashlib
+import math
+import itertools
+import sqlite3
+import threading
 import time
+import zlib
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta
-from urllib.parse import quote_plus, urlparse
+from urllib.parse import quote_plus, urljoin, urlparse, urlsplit, urlunsplit
 import json
-from bs4 import BeautifulSoup
-import nltk
-from textstat import flesch_reading_ease
 import logging
 
-# Download required NLTK data
+import text_metrics
+from article_store import ArticleStore
+from glossary import GlossaryNotFound, GlossaryStore
+
+# bs4, lxml and numpy are imported where they are used: importing the app
+# stays fast, and nothing at import time touches the network. Under gunicorn
+# warm_up() loads them in the master so the workers share them.
+
+# Optional: orjson encodes responses several times faster than the json
+# module, brotli compresses them smaller than gzip
 try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except:
-    pass
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, encoding with orjson when it is installed"""
+    
+    def dumps_bytes(self, obj):
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+            except TypeError:
+                pass  # A type orjson does not know, leave it to default()
+        return super().dumps(obj, separators=(',', ':')).encode()
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is None or set(kwargs) - {'separators'}:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+    
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
 
 # Configure logging
@@ -28,275 +77,1344 @@ logger = logging.getLogger(__name__)
 class Config:
     # NewsAPI key (get from https://newsapi.org/)
     NEWSAPI_KEY = "your_newsapi_key_here"  # Replace with your actual API key
+    NEWSAPI_URL = os.environ.get('NEWSAPI_URL', 'https://newsapi.org/v2/everything')
     
-    # Alternative news sources
-    NEWS_SOURCES = [
-        'https://economictimes.indiatimes.com',
-        'https://www.business-standard.com',
-        'https://www.livemint.com',
-        'https://www.moneycontrol.com'
-    ]
+    # Scraped news sites: name -> (display name, base URL, search path, CSS selector for result items).
+    # Selectors follow each site's current markup and need adjusting when it changes.
+    ECONOMIC_TIMES_URL = os.environ.get('ECONOMIC_TIMES_URL', 'https://economictimes.indiatimes.com')
+    NEWS_SOURCES = {
+        'economic_times': ('Economic Times', ECONOMIC_TIMES_URL, '/topic/{query}', 'div.story, div.eachStory'),
+        'business_standard': ('Business Standard', os.environ.get('BUSINESS_STANDARD_URL', 'https://www.business-standard.com'),
+                              '/search?q={query}', 'div.cardlist, div.listing-txt'),
+        'livemint': ('Livemint', os.environ.get('LIVEMINT_URL', 'https://www.livemint.com'),
+                     '/searchlisting/{query}', 'div.listingNew, h2.headline'),
+        'moneycontrol': ('Moneycontrol', os.environ.get('MONEYCONTROL_URL', 'https://www.moneycontrol.com'),
+                         '/news/tags/{query}.html', 'li.clearfix')
+    }
+    # Sources queried in parallel for every search (NewsAPI only when a key is set)
+    ENABLED_SOURCES = os.environ.get('SOURCES', ','.join(['newsapi', *NEWS_SOURCES])).split(',')
+    MAX_ARTICLES = 10  # Articles per search after merging the sources
+    LISTING_DEADLINE = 5  # Seconds to wait for source listings, slower sources are left out
+    DUPLICATE_TITLE_SIMILARITY = 0.8  # Word overlap (Jaccard) above which two titles are the same story
+    
+    # Hedging: a source slower than its usual p95 gets a duplicate request, first answer wins
+    HEDGE_PERCENTILE = 0.95
+    HEDGE_MIN_SAMPLES = 20  # Listing latencies needed before hedging a source
+    # Circuit breaker: skip a source after this many failed searches in a row, retry after the cool-down
+    BREAKER_FAILURES = 3
+    BREAKER_COOLDOWN = 60
+    
+    # Serving mode, see gunicorn.conf.py: 'sync' (default) or 'async' (gevent workers)
+    SERVING_MODE = os.environ.get('SERVING_MODE', 'sync')
+    
+    # Article fetching. Under async workers these "threads" are greenlets, so many more are cheap.
+    FETCH_WORKERS = int(os.environ.get('FETCH_WORKERS', 200 if SERVING_MODE == 'async' else 10))
+    PER_HOST_CONCURRENCY = int(os.environ.get('PER_HOST_CONCURRENCY', 4))  # Simultaneous requests to one host
+    DOMAIN_MIN_INTERVAL = float(os.environ.get('DOMAIN_MIN_INTERVAL', 0.2))  # Seconds between requests to one host
+    FETCH_DEADLINE = 15  # Seconds for a whole scrape, partial results after that
+    REQUEST_TIMEOUT = 10
+    MAX_PAGE_BYTES = 2 * 1024 * 1024  # Longer article pages are skipped, or cut off if they do not say their size
+    
+    # Glossaries: <GLOSSARY_DIR>/<locale>/<domain>.json|.csv|.sqlite, checked for changes every few seconds
+    GLOSSARY_DIR = os.environ.get('GLOSSARY_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'glossaries'))
+    DEFAULT_LOCALE = os.environ.get('GLOSSARY_LOCALE', 'en')
+    DEFAULT_DOMAIN = os.environ.get('GLOSSARY_DOMAIN', 'finance')
+    GLOSSARY_CHECK_INTERVAL = 5
+    
+    VECTORIZE_MIN_TEXTS = 32  # Smaller batches are scored text by text, NumPy's setup cost outweighs the gain
+    
+    MAX_TEXT_LENGTH = 10000  # Characters per text for /api/simplify-text and /api/simplify-batch
+    
+    # Caching: (entries, seconds to live) per layer. Set CACHE_DB to a
+    # SQLite file path to share the cache between gunicorn workers.
+    SHARED_CACHE_PATH = os.environ.get('CACHE_DB')
+    SEARCH_CACHE = (256, 300)
+    ARTICLE_CACHE = (2048, 3600)
+    ANALYSIS_CACHE = (4096, 3600)
+    
+    # Extracted article text kept on disk across restarts and shared by the
+    # workers through mmap (see article_store.py). Set ARTICLE_STORE to a file
+    # path to enable it; it then replaces the in-process article cache.
+    ARTICLE_STORE_PATH = os.environ.get('ARTICLE_STORE')
+    ARTICLE_STORE_MAX_BYTES = int(os.environ.get('ARTICLE_STORE_MAX_MB', 512)) * 1024 * 1024
+    ARTICLE_STORE_TTL = 24 * 3600  # Article pages rarely change after publication
+    
+    # Identical concurrent searches and article downloads share one
+    # computation (SINGLE_FLIGHT=0 to disable). SINGLE_FLIGHT_LEASE names a
+    # lock file that extends this across workers; it only helps together
+    # with CACHE_DB (and ARTICLE_STORE), where the result is shared.
+    SINGLE_FLIGHT = os.environ.get('SINGLE_FLIGHT', '1') == '1'
+    SINGLE_FLIGHT_LEASE = os.environ.get('SINGLE_FLIGHT_LEASE')
+    SEARCH_WAIT_TIMEOUT = 45  # Seconds a request waits for an identical search in progress
+    
+    # Admission control for the expensive endpoints, per worker (ADMISSION_CONTROL=0 to disable).
+    # class -> (requests running at once, requests queued, seconds a request may take in all or None,
+    # run time assumed until measured). Requests that cannot finish in time get 503 and Retry-After
+    # at once instead of being started; clients may ask for less time with an X-Request-Timeout header.
+    # A limit of 0 leaves that class unlimited. Sync workers serve one request at a time, so only the
+    # rate limits apply to them.
+    ADMISSION_CONTROL = os.environ.get('ADMISSION_CONTROL', '1') == '1'
+    # Searches mostly wait on the network, so a gevent worker can run many more of them than it has cores
+    SEARCH_CONCURRENCY = int(os.environ.get('SEARCH_CONCURRENCY', 50 if SERVING_MODE == 'async' else 20))
+    ADMISSION_LIMITS = {
+        'search': (SEARCH_CONCURRENCY, 2 * SEARCH_CONCURRENCY, 30, 5),
+        'titles': (20, 0, 10, 2),  # Title-only searches, served when 'search' is overloaded
+        'simplify': (8, 32, 10, 0.1),
+        'batch': (2, 4, None, 30)
+    }
+    # Per-client token buckets, also per worker: class -> (requests per second, burst); over it a client gets 429
+    RATE_LIMITS = {
+        'search': (0.5, 10),
+        'simplify': (5, 20),
+        'batch': (0.2, 3)
+    }
+    RATE_LIMITED_CLIENTS = 10000  # Buckets kept, least recently seen clients are forgotten first
+    # Proxies in front of the app that set X-Forwarded-For (1 on Render), so rate limits see client addresses
+    TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', 0))
+    # An overloaded search is answered with the last result for it (up to this old), or with the
+    # source listings simplified without downloading the articles (DEGRADED_SEARCH=0 to disable)
+    DEGRADED_SEARCH = os.environ.get('DEGRADED_SEARCH', '1') == '1'
+    LAST_SEARCHES = (256, 3600)
+    
+    # Background refresh of the trending topics into the shared cache (PREFETCH_TRENDING=1, needs CACHE_DB).
+    # The interval is capped so the next refresh, jitter and its own fetch deadline
+    # included, lands before the search cache entries of the last one expire.
+    PREFETCH_ENABLED = os.environ.get('PREFETCH_TRENDING') == '1'
+    PREFETCH_JITTER = 0.2  # Fraction of the interval
+    PREFETCH_INTERVAL = min(int(os.environ.get('PREFETCH_INTERVAL', 240)),
+                            int((SEARCH_CACHE[1] - 2 * FETCH_DEADLINE) / (1 + PREFETCH_JITTER)))
+    PREFETCH_LOCK_PATH = os.environ.get('PREFETCH_LOCK', '/tmp/news_simplifier_prefetch.lock')
+    
+    # Add a Server-Timing header with per-stage durations (SERVER_TIMING=1)
+    SERVER_TIMING = os.environ.get('SERVER_TIMING') == '1'
+    
+    # JSON and NDJSON responses are sent gzip- (or brotli-, when installed)
+    # compressed to clients that accept it (COMPRESS_RESPONSES=0 to disable)
+    COMPRESS_RESPONSES = os.environ.get('COMPRESS_RESPONSES', '1') == '1'
+    COMPRESS_MIN_BYTES = 1024  # Smaller bodies are sent as they are
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5  # Of 11; higher levels cost more CPU than they save in bytes here
 
-# Financial jargon dictionary
-FINANCIAL_JARGON = {
-    'bull market': 'a period when stock prices are rising and investor confidence is high',
-    'bear market': 'a period when stock prices are falling by 20% or more from recent highs',
-    'market capitalization': 'the total value of all a company\'s shares in the stock market',
-    'market cap': 'the total value of all a company\'s shares',
-    'volatility': 'how much and how quickly stock prices move up and down',
-    'liquidity': 'how easily an investment can be bought or sold',
-    'revenue': 'total money a company earns from sales',
-    'profit margin': 'percentage of sales that becomes profit after expenses',
-    'EBITDA': 'company earnings before paying interest, taxes, depreciation, and amortization',
-    'quarterly results': 'a company\'s financial performance report for 3 months',
-    'annual report': 'yearly document showing company\'s financial performance',
-    'fiscal year': 'a company\'s 12-month accounting period',
-    'dividend': 'regular cash payments companies make to shareholders',
-    'dividend yield': 'annual dividend payments as percentage of stock price',
-    'P/E ratio': 'compares stock price to company\'s earnings per share',
-    'price-to-earnings ratio': 'compares stock price to earnings per share',
-    'equity': 'ownership stake in a company through shares',
-    'portfolio': 'collection of different investments',
-    'IPO': 'Initial Public Offering - when company sells shares to public first time',
-    'yield': 'income return on investment as percentage',
-    'debt-to-equity ratio': 'compares company\'s debt to shareholders\' equity',
-    'current ratio': 'measures company\'s ability to pay short-term debts',
-    'ROI': 'Return on Investment - profit relative to amount invested',
-    'ROE': 'Return on Equity - how efficiently company uses shareholders\' money',
-    'gross margin': 'percentage of revenue left after cost of goods sold',
-    'inflation': 'general increase in prices over time',
-    'GDP': 'total value of goods and services produced by country',
-    'interest rates': 'cost of borrowing money as annual percentage',
-    'federal reserve': 'central bank that controls monetary policy',
-    'merger': 'when two companies combine into one',
-    'acquisition': 'when one company buys another',
-    'restructuring': 'major changes to company operations or finances',
-    'leverage': 'using borrowed money to increase potential returns',
-    'recession': 'period of economic decline with reduced business activity',
-    'rally': 'period of sustained price increases',
-    'correction': 'decline of 10% or more from recent high',
-    'balance sheet': 'statement showing assets, liabilities, and equity',
-    'cash flow': 'movement of money in and out of business',
-    'working capital': 'short-term assets minus short-term liabilities',
-    'shareholders equity': 'company value belonging to owners after debts'
-}
+if Config.TRUSTED_PROXIES:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.TRUSTED_PROXIES)
 
-# Complex phrases to simplify
-PHRASE_REPLACEMENTS = {
-    'pursuant to': 'according to',
-    'in accordance with': 'following',
-    'notwithstanding': 'despite',
-    'heretofore': 'previously',
-    'hereafter': 'from now on',
-    'whereas': 'while',
-    'commenced': 'started',
-    'terminate': 'end',
-    'utilize': 'use',
-    'demonstrate': 'show',
-    'facilitate': 'help',
-    'substantial': 'large',
-    'significant': 'important',
-    'optimize': 'improve',
-    'enhance': 'make better',
-    'mitigate': 'reduce'
-}
+TRENDING_TOPICS = [
+    'Stock Market India',
+    'Sensex',
+    'Nifty 50',
+    'RBI Policy',
+    'Indian Economy',
+    'Cryptocurrency India',
+    'Mutual Funds',
+    'IPO India',
+    'Banking Sector',
+    'IT Stocks',
+    'Auto Sector',
+    'Real Estate India',
+    'Gold Prices India',
+    'Rupee Exchange Rate',
+    'GST Updates'
+]
 
-class NewsSimplifier:
-    def __init__(self):
-        self.newsapi_key = Config.NEWSAPI_KEY
+SIMPLIFICATION_LEVELS = ('basic', 'detailed', 'expert')
+
+# Jargon and phrase glossaries, see glossary.py; the default is glossaries/en/finance.json
+GLOSSARIES = GlossaryStore(
+    Config.GLOSSARY_DIR, Config.DEFAULT_LOCALE, Config.DEFAULT_DOMAIN, Config.GLOSSARY_CHECK_INTERVAL
+)
+
+class DomainRateLimiter:
+    """Spaces out the start of requests to the same domain"""
     
-    def fetch_news_from_newsapi(self, query, language='en', sort_by='publishedAt', page_size=20):
-        """Fetch news from NewsAPI"""
-        try:
-            url = 'https://newsapi.org/v2/everything'
-            params = {
-                'q': query,
-                'language': language,
-                'sortBy': sort_by,
-                'pageSize': page_size,
-                'apiKey': self.newsapi_key
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.next_slot = {}
+        self.lock = threading.Lock()
+    
+    def wait(self, host):
+        """Block until host may be contacted again"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.min_interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+
+class PooledHTTPClient:
+    """Keep-alive session per host with a cap on concurrent requests to it"""
+    
+    def __init__(self, per_host_concurrency, min_interval):
+        self.per_host_concurrency = per_host_concurrency
+        self.rate_limiter = DomainRateLimiter(min_interval)
+        self.hosts = {}
+        self.lock = threading.Lock()
+    
+    def _host(self, host):
+        with self.lock:
+            if host not in self.hosts:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host_concurrency)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.hosts[host] = (session, threading.BoundedSemaphore(self.per_host_concurrency))
+            return self.hosts[host]
+    
+    def get(self, url, **kwargs):
+        """requests.get through the host's pooled session"""
+        host = urlparse(url).netloc
+        session, slots = self._host(host)
+        with slots:
+            self.rate_limiter.wait(host)
+            return session.get(url, **kwargs)
+    
+    def get_capped(self, url, limit, **kwargs):
+        """Stream an HTML body of at most limit bytes, holding the host slot until it is read; b'' for other pages"""
+        host = urlparse(url).netloc
+        session, slots = self._host(host)
+        with slots:
+            self.rate_limiter.wait(host)
+            response = session.get(url, stream=True, **kwargs)
+            try:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and 'html' not in content_type.lower():
+                    logger.warning(f"Skipped {url}: not HTML ({content_type})")
+                    return b''
+                length = response.headers.get('Content-Length', '')
+                if length.isdigit() and int(length) > limit:
+                    logger.warning(f"Skipped {url}: {int(length):,} bytes")
+                    return b''
+                
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= limit:
+                        break
+            finally:
+                response.close()
+        return b''.join(chunks)[:limit]
+
+class NewsAPISource:
+    """NewsAPI /v2/everything search"""
+    
+    name = 'newsapi'
+    
+    def available(self):
+        return Config.NEWSAPI_KEY != "your_newsapi_key_here"
+    
+    def fetch(self, http, query, timeout):
+        """Articles for query; raises on any failure so the circuit breaker sees it"""
+        params = {
+            'q': query + " finance",
+            'language': 'en',
+            'sortBy': 'publishedAt',
+            'pageSize': 20,
+            'apiKey': Config.NEWSAPI_KEY
+        }
+        with METRICS.timer('newsapi_fetch', source=self.name):
+            response = http.get(Config.NEWSAPI_URL, params=params, timeout=timeout)
             response.raise_for_status()
-            
             data = response.json()
-            return data.get('articles', [])
-            
-        except Exception as e:
-            logger.error(f"NewsAPI error: {str(e)}")
-            return []
+        return data.get('articles', [])
+
+class SiteSource:
+    """Search results page of one site in Config.NEWS_SOURCES, article bodies fetched later"""
     
-    def fetch_news_from_web_scraping(self, query):
-        """Fallback: Scrape news from Indian financial websites"""
-        articles = []
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def available(self):
+        return True
+    
+    def fetch(self, http, query, timeout):
+        """Titles and URLs from the site's search page; raises on any failure so the circuit breaker sees it"""
+        display_name, base_url, search_path, selector = Config.NEWS_SOURCES[self.name]
+        search_url = base_url + search_path.format(query=quote_plus(query))
         
-        try:
-            # Economic Times
-            et_articles = self.scrape_economic_times(query)
-            articles.extend(et_articles)
-            
-            # Add small delay to be respectful
-            time.sleep(1)
+        with METRICS.timer('topic_scrape', source=self.name):
+            response = http.get(search_url, headers=self.HEADERS, timeout=timeout)
+            response.raise_for_status()
             
-        except Exception as e:
-            logger.error(f"Web scraping error: {str(e)}")
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(response.content, 'html.parser')
+            article_elements = soup.select(selector)
         
+        articles = []
+        for element in article_elements[:Config.MAX_ARTICLES]:
+            try:
+                title_elem = element if element.name == 'a' else element.find('a')
+                if title_elem and title_elem.get('href'):
+                    articles.append({
+                        'title': title_elem.get_text(strip=True),
+                        'url': urljoin(base_url + '/', title_elem['href']),
+                        'source': {'name': display_name},
+                        'publishedAt': datetime.now().isoformat()
+                    })
+            except Exception as e:
+                logger.error(f"Error parsing article element: {str(e)}")
+                continue
         return articles
+
+def build_sources():
+    """Source adapters for Config.ENABLED_SOURCES, in that order"""
+    sources = []
+    for name in Config.ENABLED_SOURCES:
+        name = name.strip()
+        if name == 'newsapi':
+            sources.append(NewsAPISource())
+        elif name in Config.NEWS_SOURCES:
+            sources.append(SiteSource(name))
+        elif name:
+            logger.warning(f"Unknown news source: {name}")
+    return sources
+
+class LatencyTracker:
+    """Recent response times of one source"""
     
-    def scrape_economic_times(self, query):
-        """Scrape Economic Times for financial news"""
-        articles = []
-        try:
-            search_url = f"https://economictimes.indiatimes.com/topic/{quote_plus(query)}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find article elements (adjust selectors based on actual site structure)
-            article_elements = soup.find_all('div', class_=['story', 'eachStory'])
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+    
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+    
+    def percentile(self, fraction):
+        """The given percentile, or None until there are enough samples to trust it"""
+        with self.lock:
+            if len(self.samples) < Config.HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class CircuitBreaker:
+    """Stops calling a source after repeated failures, letting one trial call through after each cool-down"""
+    
+    def __init__(self, failure_threshold, cooldown):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+    
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_running or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.trial_running = True
+            return True
+    
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+    
+    @property
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return 'closed'
+            if self.trial_running or time.monotonic() - self.opened_at < self.cooldown:
+                return 'open'
+            return 'half_open'
+
+def normalize_url(url):
+    """URL key for de-duplication: no scheme, www., query string, fragment or trailing slash"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return urlunsplit(('', host, parts.path.rstrip('/'), '', ''))
+
+def title_words(title):
+    return frozenset(re.findall(r'[a-z0-9]+', (title or '').lower()))
+
+def dedupe_articles(articles):
+    """Drop articles whose URL or near-identical title was already seen, keeping a body from either copy"""
+    kept = []
+    seen_urls = {}
+    for article in articles:
+        url = normalize_url(article.get('url') or '')
+        words = title_words(article.get('title'))
+        
+        original = seen_urls.get(url) if url else None
+        if original is None and words:
+            for candidate, candidate_words in kept:
+                if candidate_words and len(words & candidate_words) / len(words | candidate_words) >= Config.DUPLICATE_TITLE_SIMILARITY:
+                    original = candidate
+                    break
+        
+        if original is None:
+            kept.append((article, words))
+            if url:
+                seen_urls[url] = article
+        elif not original.get('content') and article.get('content'):
+            original['content'] = article['content']
+            original['description'] = original.get('description') or article.get('description')
+    return [article for article, _ in kept]
+
+class MultiSourceFetcher:
+    """Queries every news source in parallel under one deadline, hedging slow ones, and merges the listings"""
+    
+    def __init__(self, sources, http, pool):
+        self.sources = sources
+        self.http = http
+        self.pool = pool
+        self.breakers = {source.name: CircuitBreaker(Config.BREAKER_FAILURES, Config.BREAKER_COOLDOWN) for source in sources}
+        self.latencies = {source.name: LatencyTracker() for source in sources}
+        self.hedges = {source.name: 0 for source in sources}
+    
+    def _attempt(self, source, query, timeout):
+        start = time.monotonic()
+        result = source.fetch(self.http, query, timeout)
+        self.latencies[source.name].record(time.monotonic() - start)
+        return result
+    
+    def _submit(self, source, query, deadline):
+        timeout = min(Config.REQUEST_TIMEOUT, max(0.1, deadline - time.monotonic()))
+        return self.pool.submit(self._attempt, source, query, timeout)
+    
+    def fetch(self, query, deadline):
+        """Merged article listings from all sources that answered before deadline"""
+        attempts = {}
+        hedge_at = {}
+        for source in self.sources:
+            if not source.available() or not self.breakers[source.name].allow():
+                continue
+            attempts[self._submit(source, query, deadline)] = source
+            delay = self.latencies[source.name].percentile(Config.HEDGE_PERCENTILE)
+            if delay is not None:
+                hedge_at[source.name] = time.monotonic() + delay
+        
+        asked = {source.name for source in attempts.values()}
+        results = {}
+        failed = set()
+        pending = set(attempts)
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wake = min([deadline, *hedge_at.values()])
+            done, pending = wait(pending, timeout=max(0, wake - now), return_when=FIRST_COMPLETED)
             
-            for element in article_elements[:10]:  # Limit to 10 articles
+            for future in done:
+                source = attempts[future]
+                if source.name in results:
+                    continue
                 try:
-                    title_elem = element.find('a')
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                        url = title_elem.get('href')
-                        if url and not url.startswith('http'):
-                            url = 'https://economictimes.indiatimes.com' + url
-                        
-                        # Get article content
-                        content = self.extract_article_content(url) if url else ""
-                        
-                        articles.append({
-                            'title': title,
-                            'description': content[:200] + '...' if len(content) > 200 else content,
-                            'url': url,
-                            'source': {'name': 'Economic Times'},
-                            'publishedAt': datetime.now().isoformat(),
-                            'content': content
-                        })
-                        
+                    results[source.name] = future.result()
+                    hedge_at.pop(source.name, None)
                 except Exception as e:
-                    logger.error(f"Error parsing article element: {str(e)}")
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"Economic Times scraping error: {str(e)}")
+                    if not any(attempts[other] is source for other in pending):
+                        logger.error(f"News source {source.name} error: {str(e)}")
+                        failed.add(source.name)
+                        hedge_at.pop(source.name, None)
+            # Losing hedged attempts finish in the background
+            pending = {future for future in pending if attempts[future].name not in results}
+            
+            now = time.monotonic()
+            for source in self.sources:
+                if source.name in hedge_at and hedge_at[source.name] <= now:
+                    del hedge_at[source.name]
+                    self.hedges[source.name] += 1
+                    hedge = self._submit(source, query, deadline)
+                    attempts[hedge] = source
+                    pending.add(hedge)
         
-        return articles
+        for name in asked:
+            if name in results:
+                self.breakers[name].record_success()
+            else:
+                if name not in failed:
+                    logger.warning(f"News source {name} missed the deadline")
+                self.breakers[name].record_failure()
+        
+        listings = [results[source.name] for source in self.sources if source.name in results]
+        merged = [article for round_ in itertools.zip_longest(*listings) for article in round_ if article]
+        return dedupe_articles(merged)[:Config.MAX_ARTICLES]
     
-    def extract_article_content(self, url):
-        """Extract main content from article URL"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    def stats(self):
+        return {
+            source.name: {
+                'available': source.available(),
+                'breaker': self.breakers[source.name].state,
+                'p95_seconds': self.latencies[source.name].percentile(0.95),
+                'hedged_requests': self.hedges[source.name]
             }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # Try to find main content
-            content_selectors = [
-                '.story_content',
-                '.articleBody',
-                '.story-body',
-                '.content',
-                'article',
-                '.post-content'
-            ]
-            
-            content = ""
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content = content_elem.get_text(strip=True)
+            for source in self.sources
+        }
+
+class TTLCache:
+    """In-process LRU cache whose entries expire after ttl seconds"""
+    
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key, value, ttl=None):
+        """Store value for ttl seconds (the cache's own ttl by default)"""
+        with self.lock:
+            self.entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+class SQLiteCache:
+    """LRU + TTL cache in a SQLite file, shared by every worker on the host"""
+    
+    def __init__(self, path, namespace, max_entries, ttl):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.connection = None
+        self.pid = None
+        self.lock = threading.Lock()
+    
+    def _connect(self):
+        # Connections must not cross a fork, so each worker opens its own
+        if self.pid != os.getpid():
+            self.connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache (namespace TEXT, key TEXT, value TEXT, expires REAL, used REAL, '
+                'PRIMARY KEY (namespace, key))'
+            )
+            self.connection.execute('CREATE INDEX IF NOT EXISTS cache_used ON cache (namespace, used)')
+            self.pid = os.getpid()
+        return self.connection
+    
+    def get(self, key):
+        """Return (value, seconds left to live), or None on a miss"""
+        with self.lock:
+            db = self._connect()
+            row = db.execute('SELECT value, expires FROM cache WHERE namespace = ? AND key = ?',
+                             (self.namespace, key)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if row[1] < now:
+                db.execute('DELETE FROM cache WHERE namespace = ? AND key = ?', (self.namespace, key))
+                return None
+            db.execute('UPDATE cache SET used = ? WHERE namespace = ? AND key = ?', (now, self.namespace, key))
+            return json.loads(row[0]), row[1] - now
+    
+    def set(self, key, value):
+        with self.lock:
+            db = self._connect()
+            now = time.time()
+            db.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)',
+                       (self.namespace, key, json.dumps(value), now + self.ttl, now))
+            db.execute(
+                'DELETE FROM cache WHERE namespace = ? AND key IN ('
+                'SELECT key FROM cache WHERE namespace = ? ORDER BY used DESC LIMIT -1 OFFSET ?)',
+                (self.namespace, self.namespace, self.max_entries)
+            )
+
+class LayeredCache:
+    """In-process cache in front of an optional shared one, with hit/miss counters"""
+    
+    def __init__(self, name, max_entries, ttl, shared_path=None):
+        self.name = name
+        self.local = TTLCache(max_entries, ttl)
+        self.shared = SQLiteCache(shared_path, name, max_entries, ttl) if shared_path else None
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.counter_lock = threading.Lock()
+    
+    def _count(self, counter):
+        with self.counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def get(self, key):
+        """Return the cached value, or None on a miss"""
+        value = self.local.get(key)
+        if value is not None:
+            self._count('hits')
+            return value
+        
+        if self.shared is not None:
+            entry = None
+            try:
+                entry = self.shared.get(key)
+            except sqlite3.Error as e:
+                logger.error(f"Shared cache error: {str(e)}")
+            if entry is not None:
+                # Expire locally when the shared entry does, not a full ttl later
+                value, ttl = entry
+                self.local.set(key, value, ttl)
+                self._count('shared_hits')
+                return value
+        
+        self._count('misses')
+        return None
+    
+    def set(self, key, value):
+        self.local.set(key, value)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value)
+            except sqlite3.Error as e:
+                logger.error(f"Shared cache error: {str(e)}")
+    
+    def clear(self):
+        """Drop this process's entries (the shared layer is left alone)"""
+        with self.local.lock:
+            self.local.entries.clear()
+    
+    def stats(self):
+        with self.counter_lock:
+            return {
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'entries': len(self.local.entries)
+            }
+
+SEARCH_CACHE = LayeredCache('search', *Config.SEARCH_CACHE, Config.SHARED_CACHE_PATH)
+ARTICLE_CACHE = LayeredCache('article', *Config.ARTICLE_CACHE, Config.SHARED_CACHE_PATH)
+ANALYSIS_CACHE = LayeredCache('analysis', *Config.ANALYSIS_CACHE, Config.SHARED_CACHE_PATH)
+ARTICLE_STORE = ArticleStore(
+    Config.ARTICLE_STORE_PATH, Config.ARTICLE_STORE_MAX_BYTES, Config.ARTICLE_STORE_TTL
+) if Config.ARTICLE_STORE_PATH else None
+
+class SingleFlight:
+    """Run one call per key at a time; concurrent callers with the same key wait for its outcome"""
+    
+    LEASE_POLL = 0.05
+    
+    class Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+    
+    def __init__(self, name, lease_path=None, enabled=True):
+        self.name = name
+        self.lease_path = lease_path
+        self.enabled = enabled
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.lease_fd = None
+        self.lease_pid = None
+        self.leaders = 0
+        self.joined = 0
+        self.lease_waits = 0
+    
+    def join(self, key):
+        """(call, whether the caller leads it); a leader must pass its outcome to finish()"""
+        with self.lock:
+            call = self.calls.get(key) if self.enabled else None
+            if call is not None:
+                return call, False
+            call = self.Call()
+            if self.enabled:
+                self.calls[key] = call
+                self.leaders += 1
+            return call, True
+    
+    def finish(self, key, call, result=None, error=None):
+        """Hand a leader's result or error to its waiters; later calls for the same call do nothing"""
+        with self.lock:
+            if call.done.is_set():
+                return
+            call.result = result
+            call.error = error
+            if self.calls.get(key) is call:
+                del self.calls[key]
+            call.done.set()
+    
+    def wait(self, call, timeout):
+        """Outcome of another caller's call"""
+        self.joined += 1
+        if not call.done.wait(timeout):
+            raise TimeoutError(f"Waited {timeout:.1f}s for a {self.name} already in progress")
+        if call.error is not None:
+            raise call.error
+        return call.result
+    
+    def do(self, key, func, timeout):
+        if not self.enabled:
+            return func()
+        
+        call, leader = self.join(key)
+        if not leader:
+            return self.wait(call, timeout)
+        
+        try:
+            result = self._lead(key, func, timeout)
+        except Exception as e:
+            self.finish(key, call, error=e)
+            raise
+        except BaseException as e:
+            # The leader was killed (GreenletExit, KeyboardInterrupt); that is not the waiters' to raise
+            self.finish(key, call, error=RuntimeError(f"The {self.name} being waited for was interrupted ({type(e).__name__})"))
+            raise
+        self.finish(key, call, result)
+        return result
+    
+    def _lead(self, key, func, timeout):
+        if not self.lease_path:
+            return func()
+        
+        # One byte per key in the lease file; record locks are per process, and
+        # within a process the calls above already coalesce
+        if self.lease_pid != os.getpid():
+            self.lease_fd = os.open(self.lease_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self.lease_pid = os.getpid()
+        offset = int.from_bytes(hashlib.sha1(f"{self.name}|{key}".encode()).digest()[:4], 'big')
+        
+        # Polled rather than blocking, so gevent workers keep serving meanwhile
+        deadline = time.monotonic() + timeout
+        leased = False
+        for attempt in itertools.count():
+            try:
+                fcntl.lockf(self.lease_fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset)
+                leased = True
+                break
+            except OSError:
+                if attempt == 0:
+                    self.lease_waits += 1
+                if time.monotonic() >= deadline:
+                    # Better a duplicate upstream call than no answer
+                    logger.warning(f"Single-flight lease for {self.name} timed out, running anyway")
                     break
+                time.sleep(self.LEASE_POLL)
+        
+        try:
+            return func()
+        finally:
+            if leased:
+                fcntl.lockf(self.lease_fd, fcntl.LOCK_UN, 1, offset)
+    
+    def stats(self):
+        return {
+            'leaders': self.leaders,
+            'joined': self.joined,
+            'lease_waits': self.lease_waits,
+            'in_flight': len(self.calls)
+        }
+
+SEARCH_FLIGHTS = SingleFlight('search', Config.SINGLE_FLIGHT_LEASE, Config.SINGLE_FLIGHT)
+FETCH_FLIGHTS = SingleFlight('article fetch', Config.SINGLE_FLIGHT_LEASE, Config.SINGLE_FLIGHT)
+
+class Shed(Exception):
+    """A request refused by admission control, answered with status and a Retry-After of retry_after seconds"""
+    
+    def __init__(self, message, status, retry_after):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Bounded concurrency and queue for one class of endpoints, shedding requests that cannot finish in time"""
+    
+    SMOOTHING = 0.2  # Weight of the latest run time in the moving average
+    
+    def __init__(self, name, limit, queue_size, deadline, service_time):
+        if limit < 0 or queue_size < 0:
+            raise ValueError(f"Admission limits for {name} must not be negative: {limit} running, {queue_size} queued")
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.deadline = deadline
+        self.service_time = service_time
+        self.measured = False
+        self.running = 0
+        self.waiters = deque()
+        self.lock = threading.Lock()
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+    
+    def _expected_wait(self, position):
+        # Slots free up limit times per run time on average
+        return (position + 1) * self.service_time / self.limit
+    
+    def _refuse(self, reason, retry_after):
+        self.shed += 1
+        raise Shed(f"{self.name} {reason}", 503, retry_after)
+    
+    def acquire(self, deadline=None):
+        """Take a slot, queueing for it if need be; returns the start time for release(), raises Shed if refused"""
+        with self.lock:
+            if (self.running < self.limit or not self.limit) and not self.waiters:
+                self.running += 1
+                self.admitted += 1
+                return time.monotonic()
             
-            # If no specific content found, get all paragraphs
-            if not content:
-                paragraphs = soup.find_all('p')
-                content = ' '.join([p.get_text(strip=True) for p in paragraphs])
-            
+            position = len(self.waiters)
+            wait = self._expected_wait(position)
+            if position >= self.queue_size:
+                self._refuse('overloaded', wait)
+            if deadline is not None and time.monotonic() + wait + self.service_time > deadline:
+                self._refuse('cannot finish before the deadline', wait)
+            waiter = threading.Event()
+            self.waiters.append(waiter)
+        
+        # Wait no longer than the latest start that can still finish in time
+        timeout = None if deadline is None else max(0, deadline - self.service_time - time.monotonic())
+        if not waiter.wait(timeout):
+            with self.lock:
+                # release() may have handed over the slot just as the wait ran out
+                if not waiter.is_set():
+                    self.waiters.remove(waiter)
+                    self.timed_out += 1
+                    self._refuse('queue wait exceeded the deadline', self._expected_wait(len(self.waiters)))
+        return time.monotonic()
+    
+    def release(self, started):
+        with self.lock:
+            elapsed = time.monotonic() - started
+            if self.measured:
+                self.service_time += self.SMOOTHING * (elapsed - self.service_time)
+            else:
+                self.service_time = elapsed
+                self.measured = True
+            if self.waiters:
+                self.waiters.popleft().set()
+                self.admitted += 1
+            else:
+                self.running -= 1
+    
+    def stats(self):
+        return {
+            'running': self.running,
+            'queued': len(self.waiters),
+            'limit': self.limit,
+            'queue_size': self.queue_size,
+            'admitted': self.admitted,
+            'shed': self.shed,
+            'timed_out': self.timed_out,
+            'service_time': round(self.service_time, 3)
+        }
+
+class ClientRateLimiter:
+    """Token bucket per client: rate requests per second on average, bursts of up to burst"""
+    
+    def __init__(self, rate, burst, max_clients):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.buckets = OrderedDict()  # client -> (tokens, updated), least recently seen first
+        self.lock = threading.Lock()
+        self.limited = 0
+    
+    def take(self, client):
+        """0 when client may go ahead, otherwise the seconds until it may"""
+        with self.lock:
+            now = time.monotonic()
+            tokens, updated = self.buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            wait = 0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+                self.limited += 1
+            self.buckets[client] = (tokens, now)
+            if len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)
+        return wait
+    
+    def stats(self):
+        return {'clients': len(self.buckets), 'limited': self.limited}
+
+ADMISSION = {name: AdmissionController(name, *limits) for name, limits in Config.ADMISSION_LIMITS.items()}
+RATE_LIMITERS = {
+    name: ClientRateLimiter(rate, burst, Config.RATE_LIMITED_CLIENTS) for name, (rate, burst) in Config.RATE_LIMITS.items()
+}
+# The last result of each search, kept longer than SEARCH_CACHE keeps it. It
+# holds the same objects, so it costs little memory.
+LAST_SEARCHES = TTLCache(*Config.LAST_SEARCHES)
+
+RESPONSE_FORMATS = ('full', 'compact')
+
+class ResponseFormatError(ValueError):
+    """Unknown format or malformed fields in a request"""
+
+def full_analysis(analysis):
+    """An analyze() result as sent in the full format, without the span encoding"""
+    return {key: value for key, value in analysis.items() if key != 'simplified_spans'}
+
+def full_article(article):
+    """A simplify_article() result as sent in the full format"""
+    simplified = article['simplified']
+    return {**article, 'simplified': {'title': simplified['title'], 'content': simplified['content']}}
+
+def project(data, fields):
+    """Only the dotted paths in fields, e.g. ['original.title', 'analysis']; unknown paths are skipped"""
+    paths = [field.split('.') for field in fields]
+    # A path below one also requested is already included
+    wanted = {tuple(path) for path in paths}
+    paths = [path for path in paths if not any(tuple(path[:i]) in wanted for i in range(1, len(path)))]
+    
+    result = {}
+    for path in paths:
+        value = data
+        for name in path:
+            if not isinstance(value, dict) or name not in value:
+                break
+            value = value[name]
+        else:
+            target = result
+            for name in path[:-1]:
+                target = target.setdefault(name, {})
+            target[path[-1]] = value
+    return result
+
+def compact_article(article, fields=None, spans=True):
+    """A simplify_article() result in the compact format, keeping only fields (all when None)"""
+    compact = full_article(article)
+    if fields:
+        compact = project(compact, fields)
+    
+    # Each [start, end, i] span replaces code points start:end of original.content with texts[i]. Left out
+    # of compressed responses, where gzip already encodes the simplified text as back-references.
+    spans = article['simplified'].get('spans') if spans else None
+    simplified = compact.get('simplified', {})
+    if spans is not None and 'content' in simplified and 'content' in compact.get('original', {}):
+        simplified = {key: value for key, value in simplified.items() if key != 'content'}
+        simplified['spans'] = spans
+        simplified['texts'] = [item['replacement'] for item in article['analysis']['replacements']]
+        compact['simplified'] = simplified
+    return compact
+
+def encode_article(article, response_format='full', fields=None, spans=True):
+    if response_format == 'compact':
+        return compact_article(article, fields, spans)
+    return full_article(article)
+
+def encode_search(result, response_format='full', fields=None, spans=True):
+    """A search result in the requested format; fields select article fields"""
+    return {
+        **result,
+        'articles': [encode_article(article, response_format, fields, spans) for article in result['articles']]
+    }
+
+def encode_text_result(text, analysis, response_format='full', fields=None):
+    """The /api/simplify-text response in the requested format, with spans as in compact_article()"""
+    if response_format != 'compact':
+        return {'original_text': text, **full_analysis(analysis)}
+    
+    compact = full_analysis(analysis)
+    if fields:
+        compact = project(compact, fields)
+    
+    spans = analysis.get('simplified_spans')
+    if spans is not None and 'simplified_text' in compact:
+        del compact['simplified_text']
+        compact['simplified_spans'] = spans
+        compact['simplified_texts'] = [item['replacement'] for item in analysis['replacements']]
+    return compact
+
+def response_options(data):
+    """(format, fields) requested in a JSON body"""
+    response_format = data.get('format', 'full')
+    fields = data.get('fields')
+    if response_format not in RESPONSE_FORMATS:
+        raise ResponseFormatError(f"Unknown format {response_format!r}, expected one of {', '.join(RESPONSE_FORMATS)}")
+    if fields is not None and (not isinstance(fields, list) or not all(isinstance(field, str) for field in fields)):
+        raise ResponseFormatError('fields must be a list of field names')
+    return response_format, fields
+
+def search_cache_key(query, level, glossary):
+    return f"{query}|{level}|{glossary.version}"
+
+class StageMetrics:
+    """Latency histograms per pipeline stage for this worker, rendered in Prometheus text format"""
+    
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+    
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+    
+    @contextmanager
+    def timer(self, stage, source='', level=''):
+        """Time the with-block as one observation of stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, source, level)
+    
+    def observe(self, stage, seconds, source='', level=''):
+        labels = (stage, source, level)
+        with self.lock:
+            histogram = self.histograms.get(labels)
+            if histogram is None:
+                histogram = self.histograms[labels] = {'buckets': [0] * len(self.BUCKETS), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+        
+        # Stages run on the request thread also go into its Server-Timing header
+        if Config.SERVER_TIMING and has_request_context():
+            timings = g.setdefault('server_timing', {})
+            timings[stage] = timings.get(stage, 0) + seconds
+    
+    def render(self):
+        """Prometheus exposition text for the stage histograms and cache counters"""
+        lines = [
+            '# HELP news_simplifier_stage_seconds Time spent in each request pipeline stage',
+            '# TYPE news_simplifier_stage_seconds histogram'
+        ]
+        with self.lock:
+            histograms = {labels: dict(h, buckets=list(h['buckets'])) for labels, h in self.histograms.items()}
+        
+        for (stage, source, level), histogram in sorted(histograms.items()):
+            labels = f'stage="{prometheus_escape(stage)}",source="{prometheus_escape(source)}",level="{prometheus_escape(level)}"'
+            for bound, count in zip(self.BUCKETS, histogram['buckets']):
+                lines.append(f'news_simplifier_stage_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'news_simplifier_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram["count"]}')
+            lines.append(f'news_simplifier_stage_seconds_sum{{{labels}}} {histogram["sum"]}')
+            lines.append(f'news_simplifier_stage_seconds_count{{{labels}}} {histogram["count"]}')
+        
+        lines.append('# HELP news_simplifier_cache_lookups_total Cache lookups by layer and result')
+        lines.append('# TYPE news_simplifier_cache_lookups_total counter')
+        for cache in (SEARCH_CACHE, ARTICLE_CACHE, ANALYSIS_CACHE):
+            stats = cache.stats()
+            for result in ('hits', 'shared_hits', 'misses'):
+                lines.append(f'news_simplifier_cache_lookups_total{{cache="{cache.name}",result="{result}"}} {stats[result]}')
+        
+        return '\n'.join(lines) + '\n'
+
+def prometheus_escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+METRICS = StageMetrics()
+
+class ArticleTextTarget:
+    """lxml parser target that extracts article text in a single pass while the page is parsed"""
+    
+    PRUNED_TAGS = {'script', 'style', 'nav', 'header', 'footer', 'aside'}
+    
+    # BeautifulSoup leaves text inside these out of get_text()
+    HIDDEN_TEXT_TAGS = {'rt', 'rp', 'template'}
+    
+    # In priority order: .story_content, .articleBody, .story-body, .content, article, .post-content
+    CONTENT_SELECTORS = [
+        ('class', 'story_content'),
+        ('class', 'articleBody'),
+        ('class', 'story-body'),
+        ('class', 'content'),
+        ('tag', 'article'),
+        ('class', 'post-content')
+    ]
+    
+    def __init__(self):
+        self.stack = []
+        self.pruned = 0
+        self.hidden = 0
+        self.buffer = []
+        self.open_parts = []
+        self.selected = [None] * len(self.CONTENT_SELECTORS)
+        self.paragraphs = []
+    
+    def _flush(self):
+        # A text node ends at any tag or comment; each one is stripped on its own
+        if self.buffer:
+            text = ''.join(self.buffer).strip()
+            self.buffer = []
+            if text:
+                for parts in self.open_parts:
+                    parts.append(text)
+    
+    def start(self, tag, attrib):
+        self._flush()
+        pruned = self.pruned > 0 or tag in self.PRUNED_TAGS
+        hidden = tag in self.HIDDEN_TEXT_TAGS
+        opened = []
+        
+        if pruned:
+            self.pruned += 1
+        else:
+            classes = attrib.get('class', '').split()
+            for i, (kind, value) in enumerate(self.CONTENT_SELECTORS):
+                if self.selected[i] is None and (value in classes if kind == 'class' else tag == value):
+                    self.selected[i] = []
+                    opened.append(self.selected[i])
+            if tag == 'p':
+                self.paragraphs.append([])
+                opened.append(self.paragraphs[-1])
+            self.open_parts.extend(opened)
+        
+        if hidden:
+            self.hidden += 1
+        self.stack.append((pruned, hidden, opened))
+    
+    def end(self, tag):
+        self._flush()
+        pruned, hidden, opened = self.stack.pop()
+        if pruned:
+            self.pruned -= 1
+        if hidden:
+            self.hidden -= 1
+        # Elements close in reverse order, so this element's parts are the last ones opened
+        if opened:
+            del self.open_parts[-len(opened):]
+    
+    def data(self, data):
+        if not self.pruned and not self.hidden:
+            self.buffer.append(data)
+    
+    def comment(self, text):
+        self._flush()
+    
+    def pi(self, target, data=None):
+        self._flush()
+    
+    def close(self):
+        self._flush()
+        
+        # Try to find main content
+        content = ""
+        for parts in self.selected:
+            if parts is not None:
+                content = ''.join(parts)
+                break
+        
+        # If no specific content found, get all paragraphs
+        if not content:
+            content = ' '.join(''.join(parts) for parts in self.paragraphs)
+        
+        return content
+
+def extract_main_content(markup):
+    """Extract the main article text from raw HTML bytes"""
+    from bs4 import UnicodeDammit
+    from lxml import etree
+    
+    # Decode the way BeautifulSoup would, so undeclared encodings come out the same
+    text = UnicodeDammit(markup, is_html=True).unicode_markup
+    if not text:
+        return ""
+    
+    parser = etree.HTMLParser(target=ArticleTextTarget())
+    parser.feed(text)
+    return parser.close()
+
+def run_cpu_bound(func, *args, **kwargs):
+    """Call func, on a native thread under gevent so CPU work does not stall the worker's event loop"""
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('socket'):
+        import gevent
+        return gevent.get_hub().threadpool.apply(func, args, kwargs)
+    return func(*args, **kwargs)
+
+# NewsSimplifier._score_complexity as array operations; keep the thresholds in step with it
+COMPLEXITY_LEVELS = ('Low', 'Medium', 'High')
+
+def score_complexity_array(stats, jargon_counts):
+    """Complexity levels for arrays of text_stats() counts, identical to _score_complexity per element"""
+    import numpy as np
+    
+    word_count = stats['word_count']
+    sentence_count = stats['sentence_count']
+    
+    avg_word_length = np.divide(stats['word_chars'], word_count, out=np.zeros(len(word_count)), where=word_count > 0)
+    avg_sentence_length = np.divide(word_count, sentence_count, out=np.zeros(len(word_count)), where=sentence_count > 0)
+    
+    # digitize counts the thresholds each value reached, which is the points it scores
+    complexity_score = (
+        np.digitize(jargon_counts, [1, 3, 6, 10]) +
+        np.digitize(avg_word_length, [4.5, 5.5, 7]) +
+        np.digitize(avg_sentence_length, [12, 18, 25])
+    )
+    return np.array(COMPLEXITY_LEVELS)[np.digitize(complexity_score, [4, 7])]
+
+class NewsSimplifier:
+    def __init__(self):
+        self.http = PooledHTTPClient(Config.PER_HOST_CONCURRENCY, Config.DOMAIN_MIN_INTERVAL)
+        self.fetch_pool = ThreadPoolExecutor(max_workers=Config.FETCH_WORKERS, thread_name_prefix='fetch')
+        self.sources = MultiSourceFetcher(build_sources(), self.http, self.fetch_pool)
+    
+    def iter_articles(self, query):
+        """Fetch articles from all sources, yielding (position, article) as each one is complete"""
+        deadline = time.monotonic() + Config.FETCH_DEADLINE
+        articles = self.sources.fetch(query, min(deadline, time.monotonic() + Config.LISTING_DEADLINE))
+        
+        missing = []
+        for i, article in enumerate(articles):
+            if article.get('content'):
+                yield i, article
+            else:
+                missing.append(i)
+        
+        # Get article content, all articles at once
+        for j, content in self.iter_article_contents([articles[i]['url'] for i in missing], deadline):
+            article = articles[missing[j]]
+            article['description'] = content[:200] + '...' if len(content) > 200 else content
+            article['content'] = content
+            yield missing[j], article
+    
+    def iter_article_contents(self, urls, deadline):
+        """Extract several articles concurrently, yielding (index, content) as each finishes, '' past the deadline"""
+        futures = {}
+        for i, url in enumerate(urls):
+            remaining = deadline - time.monotonic()
+            if url and remaining > 0:
+                futures[self.fetch_pool.submit(self.extract_article_content, url, min(Config.REQUEST_TIMEOUT, remaining))] = i
+        
+        pending = set(range(len(urls)))
+        try:
+            for future in as_completed(futures, timeout=max(0, deadline - time.monotonic())):
+                i = futures[future]
+                pending.discard(i)
+                yield i, future.result()
+        except TimeoutError:
+            skipped = [future for future in futures if not future.done()]
+            for future in skipped:
+                future.cancel()
+            logger.warning(f"Fetch deadline passed, {len(skipped)} of {len(futures)} articles skipped")
+        
+        for i in sorted(pending):
+            yield i, ""
+    
+    def extract_article_content(self, url, timeout=Config.REQUEST_TIMEOUT):
+        """Extract main content from article URL"""
+        content = self._cached_article(url)
+        if content is not None:
             return content
-            
+        
+        try:
+            # Concurrent requests for the same URL share one download
+            return FETCH_FLIGHTS.do(url, lambda: self._download_article(url, timeout), timeout)
         except Exception as e:
             logger.error(f"Content extraction error: {str(e)}")
             return ""
     
-    def detect_financial_jargon(self, text):
-        """Detect financial jargon in text"""
-        detected_jargon = []
-        text_lower = text.lower()
-        
-        for term, explanation in FINANCIAL_JARGON.items():
-            # Use word boundary regex to avoid partial matches
-            pattern = r'\b' + re.escape(term.lower()) + r'\b'
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                detected_jargon.append({
-                    'term': term,
-                    'explanation': explanation,
-                    'count': len(matches)
-                })
+    def _cached_article(self, url):
+        try:
+            return (ARTICLE_STORE or ARTICLE_CACHE).get(url)
+        except OSError as e:
+            logger.error(f"Article store error: {str(e)}")
+            return None
+    
+    def _download_article(self, url, timeout):
+        """Fetch and extract url; raises on failure"""
+        if FETCH_FLIGHTS.lease_path:
+            # The worker that held the lease before may have stored it
+            content = self._cached_article(url)
+            if content is not None:
+                return content
+        
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        host = urlparse(url).netloc
+        with METRICS.timer('article_fetch', source=host):
+            markup = self.http.get_capped(url, Config.MAX_PAGE_BYTES, headers=headers, timeout=timeout)
+        if not markup:
+            return ""
         
-        return sorted(detected_jargon, key=lambda x: x['count'], reverse=True)
+        with METRICS.timer('article_extract', source=host):
+            content = extract_main_content(markup)
+        
+        if content:
+            try:
+                (ARTICLE_STORE or ARTICLE_CACHE).set(url, content)
+            except OSError as e:
+                logger.error(f"Article store error: {str(e)}")
+        return content
     
-    def simplify_text(self, text, level='basic'):
+    def detect_financial_jargon(self, text, glossary=None):
+        """Detect financial jargon in text"""
+        glossary = glossary or GLOSSARIES.get()
+        # One scan over the text counts every term, using word boundaries to avoid partial matches
+        counts = glossary.jargon_matcher.count(glossary.jargon_matcher.scan(text))
+        return glossary.jargon_list(counts)
+    
+    def simplify_text(self, text, level='basic', glossary=None):
         """Simplify financial text"""
-        simplified = text
+        glossary = glossary or GLOSSARIES.get()
+        return self._rewrite(text, glossary.rewrite_matcher.scan(text), level, glossary)
+    
+    def _rewrite(self, text, matches, level, glossary):
+        """Apply replacements for the given glossary.rewrite_matcher matches in one join"""
+        pieces = []
         replacements = []
+        seen = {}
+        position = 0
         
-        # Replace financial jargon
-        for term, explanation in FINANCIAL_JARGON.items():
-            pattern = r'\b' + re.escape(term) + r'\b'
-            if re.search(pattern, simplified, re.IGNORECASE):
-                if level == 'expert':
-                    replacement = f"{term} ({explanation})"
-                elif level == 'detailed':
-                    replacement = f"{explanation} ({term})"
-                else:  # basic
-                    replacement = explanation
-                
-                simplified = re.sub(pattern, replacement, simplified, flags=re.IGNORECASE)
+        # Jargon and complex phrases are matched together, longest first, so
+        # inserted explanations are never rewritten again
+        edits = []
+        spans = []
+        for start, end, key in glossary.rewrite_matcher.longest(matches):
+            original, replacement = glossary.replacement(key, level)
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            edits.append((start, end, replacement))
+            position = end
+            
+            if key not in seen:
+                seen[key] = len(replacements)
                 replacements.append({
-                    'original': term,
+                    'original': original,
                     'replacement': replacement
                 })
+            spans.append((start, end, seen[key]))
         
-        # Replace complex phrases
-        for complex_phrase, simple_phrase in PHRASE_REPLACEMENTS.items():
-            pattern = r'\b' + re.escape(complex_phrase) + r'\b'
-            if re.search(pattern, simplified, re.IGNORECASE):
-                simplified = re.sub(pattern, simple_phrase, simplified, flags=re.IGNORECASE)
-                replacements.append({
-                    'original': complex_phrase,
-                    'replacement': simple_phrase
-                })
+        pieces.append(text[position:])
         
         return {
-            'text': simplified,
-            'replacements': replacements
+            'text': ''.join(pieces),
+            'replacements': replacements,
+            'edits': edits,
+            'spans': spans
         }
     
+    def text_stats(self, text):
+        """Count words, characters in words, sentences and syllables"""
+        return text_metrics.measure(text)
+    
     def calculate_complexity(self, text, jargon_count):
         """Calculate text complexity level"""
-        words = text.split()
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        return self._score_complexity(self.text_stats(text), jargon_count)
+    
+    def _score_complexity(self, stats, jargon_count):
+        """Calculate text complexity level from text_stats()"""
+        word_count = stats['word_count']
+        sentence_count = stats['sentence_count']
         
-        avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
+        avg_word_length = stats['word_chars'] / word_count if word_count else 0
+        avg_sentence_length = word_count / sentence_count if sentence_count else 0
         
         complexity_score = 0
         
@@ -334,14 +1452,15 @@ class NewsSimplifier:
             return 'Low'
     
     def calculate_readability_score(self, text):
-        """Calculate readability score using textstat"""
-        try:
-            score = flesch_reading_ease(text)
-            return max(0, min(100, round(score)))
-        except:
-            return 50  # Default middle score if calculation fails
+        """Calculate readability score (Flesch Reading Ease, as textstat computes it)"""
+        return self._score_readability(self.text_stats(text))
+    
+    def _score_readability(self, stats):
+        """Calculate readability score from text_stats()"""
+        score = text_metrics.flesch_reading_ease(stats)
+        return max(0, min(100, round(score)))
     
-    def generate_insights(self, text, jargon_list):
+    def generate_insights(self, text, jargon_list, word_count=None):
         """Generate key insights about the text"""
         insights = []
         
@@ -366,7 +1485,8 @@ class NewsSimplifier:
                 'description': 'The content covers market conditions and trading-related information.'
             })
         
-        word_count = len(text.split())
+        if word_count is None:
+            word_count = len(text.split())
         if word_count > 500:
             insights.append({
                 'title': 'Comprehensive Article',
@@ -374,112 +1494,671 @@ class NewsSimplifier:
             })
         
         return insights
-
-# Initialize the news simplifier
-news_simplifier = NewsSimplifier()
-
-@app.route('/')
-def index():
-    """Main page"""
-    return render_template('news_simplifier.html')
-
-@app.route('/api/search-news', methods=['POST'])
-def search_news():
-    """Search for news articles and return simplified versions"""
-    try:
-        data = request.get_json()
-        query = data.get('query', '').strip()
-        simplification_level = data.get('level', 'basic')
+    
+    def analyze(self, text, level='basic', title=None, glossary=None):
+        """Detect, simplify and score text in one scan, the simplified title included when text starts with title"""
+        glossary = glossary or GLOSSARIES.get()
+        cache_key = self._analysis_cache_key(text, level, title, glossary)
+        result = ANALYSIS_CACHE.get(cache_key)
+        if result is not None:
+            return result
         
-        if not query:
-            return jsonify({'error': 'Query is required'}), 400
+        result, stats, simplified_stats = self._analyze_text(text, level, title, glossary)
         
-        logger.info(f"Searching news for query: {query}")
+        with METRICS.timer('complexity', level=level):
+            result['complexity'] = self._score_complexity(stats, result['jargon_count'])
         
-        # Fetch news articles
-        articles = []
+        with METRICS.timer('readability', level=level):
+            result['readability_score'] = self._score_readability(simplified_stats)
+        
+        ANALYSIS_CACHE.set(cache_key, result)
+        return result
+    
+    def analyze_many(self, texts, level='basic', titles=None, glossary=None):
+        """analyze() for many texts, with the complexity and readability scores computed as NumPy array operations"""
+        glossary = glossary or GLOSSARIES.get()
+        titles = titles or [None] * len(texts)
+        results = [None] * len(texts)
+        pending = []
+        repeats = {}
+        for i, (text, title) in enumerate(zip(texts, titles)):
+            cache_key = self._analysis_cache_key(text, level, title, glossary)
+            if cache_key in repeats:
+                repeats[cache_key].append(i)
+                continue
+            results[i] = ANALYSIS_CACHE.get(cache_key)
+            if results[i] is None:
+                repeats[cache_key] = []
+                pending.append((i, cache_key, *self._analyze_text(text, level, title, glossary)))
         
-        # Try NewsAPI first
-        if news_simplifier.newsapi_key != "your_newsapi_key_here":
-            articles = news_simplifier.fetch_news_from_newsapi(query + " finance")
+        if not pending:
+            return results
         
-        # If no articles from NewsAPI or no API key, try web scraping
-        if not articles:
-            articles = news_simplifier.fetch_news_from_web_scraping(query)
+        if len(pending) < Config.VECTORIZE_MIN_TEXTS:
+            for _, _, result, stats, simplified_stats in pending:
+                with METRICS.timer('complexity', level=level):
+                    result['complexity'] = self._score_complexity(stats, result['jargon_count'])
+                with METRICS.timer('readability', level=level):
+                    result['readability_score'] = self._score_readability(simplified_stats)
+        else:
+            self._score_many(pending, level)
+        
+        for i, cache_key, result, _, _ in pending:
+            ANALYSIS_CACHE.set(cache_key, result)
+            for j in [i, *repeats[cache_key]]:
+                results[j] = result
+        return results
+    
+    def _score_many(self, pending, level):
+        """Fill in complexity and readability for analyze_many() results as array operations"""
+        import numpy as np
+        
+        with METRICS.timer('batch_scoring', level=level):
+            start = time.perf_counter()
+            stats = {key: np.fromiter((item[3][key] for item in pending), dtype=np.int64, count=len(pending))
+                     for key in text_metrics.COUNT_KEYS}
+            jargon_counts = np.fromiter((item[2]['jargon_count'] for item in pending), dtype=np.int64, count=len(pending))
+            complexities = score_complexity_array(stats, jargon_counts)
+            complexity_seconds = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            simplified_stats = {key: np.fromiter((item[4][key] for item in pending), dtype=np.int64, count=len(pending))
+                                for key in text_metrics.COUNT_KEYS}
+            readability_scores = np.clip(np.rint(text_metrics.flesch_reading_ease_array(simplified_stats)), 0, 100).astype(int)
+            readability_seconds = time.perf_counter() - start
+        
+        # Each text gets its share, so the complexity and readability histograms count it as analyze() would
+        for _ in pending:
+            METRICS.observe('complexity', complexity_seconds / len(pending), level=level)
+            METRICS.observe('readability', readability_seconds / len(pending), level=level)
+        
+        for (_, _, result, _, _), complexity, readability_score in zip(pending, complexities, readability_scores):
+            result['complexity'] = str(complexity)
+            result['readability_score'] = int(readability_score)
+    
+    def _analysis_cache_key(self, text, level, title, glossary):
+        content_hash = hashlib.sha1(f"{title}\0{text}".encode()).hexdigest()
+        return f"{content_hash}|{level}|{title is not None}|{glossary.version}"
+    
+    def _analyze_text(self, text, level, title, glossary):
+        """Everything in analyze() except the two scores, plus the counts they are computed from"""
+        with METRICS.timer('term_scan', level=level):
+            matches = list(glossary.rewrite_matcher.scan(text))
+        
+        with METRICS.timer('jargon_detection', level=level):
+            counts = glossary.rewrite_matcher.count(matches)
+            detected_jargon = glossary.jargon_list(counts)
+        
+        with METRICS.timer('simplification', level=level):
+            simplified_result = self._rewrite(text, matches, level, glossary)
+        
+        with METRICS.timer('text_stats', level=level):
+            stats = self.text_stats(text)
+            # The simplified text is scored from the original's counts plus the replacements
+            simplified_stats = text_metrics.apply_edits(stats, text, simplified_result['edits'])
+        
+        with METRICS.timer('insights', level=level):
+            insights = self.generate_insights(text, detected_jargon, stats['word_count'])
+        
+        result = {
+            'simplified_text': simplified_result['text'],
+            'jargon_detected': detected_jargon,
+            'jargon_count': len(detected_jargon),
+            'complexity': None,
+            'readability_score': None,
+            'insights': insights,
+            'replacements': simplified_result['replacements'],
+            # [start, end, index into replacements] for each rewritten span, see compact_article()
+            'simplified_spans': simplified_result['spans']
+        }
+        
+        if title is not None:
+            title_matches = [m for m in matches if m[0] < len(title)]
+            # A term running past the end of the title needs a scan of its own
+            if not text.startswith(title) or any(end > len(title) for _, end, _ in title_matches):
+                title_matches = glossary.rewrite_matcher.scan(title)
+            result['simplified_title'] = self._rewrite(title, title_matches, level, glossary)['text']
+        
+        return result, stats, simplified_stats
+    
+    def simplify_record(self, line, level='basic', max_length=None, glossary=None):
+        """Analyze one JSONL line of a batch, a JSON string or an object with 'text'; problems are returned, not raised"""
+        return self.simplify_records([line], level, max_length, glossary)[0]
+    
+    def simplify_records(self, lines, level='basic', max_length=None, glossary=None):
+        """simplify_record() for several lines, analyzing each level's texts together"""
+        results = [None] * len(lines)
+        by_level = {}
+        for i, line in enumerate(lines):
+            record_id = None
+            try:
+                record = json.loads(line)
+                if isinstance(record, str):
+                    record = {'text': record}
+                record_id = record.get('id')
+                
+                text = (record.get('text') or '').strip()
+                if not text:
+                    results[i] = {'id': record_id, 'error': 'Text is required'}
+                elif max_length and len(text) > max_length:
+                    results[i] = {'id': record_id, 'error': f'Text too long (max {max_length:,} characters)'}
+                else:
+                    by_level.setdefault(record.get('level', level), []).append((i, record_id, text))
+                    
+            except Exception as e:
+                results[i] = {'id': record_id, 'error': str(e)}
         
+        for record_level, records in by_level.items():
+            try:
+                analyses = self.analyze_many([text for _, _, text in records], record_level, glossary=glossary)
+            except Exception as e:
+                for i, record_id, _ in records:
+                    results[i] = {'id': record_id, 'error': str(e)}
+                continue
+            for (i, record_id, text), analysis in zip(records, analyses):
+                results[i] = {'id': record_id, 'original_text': text, **full_analysis(analysis)}
+        
+        return results
+    
+    def search(self, query, simplification_level='basic', glossary=None):
+        """Fetch articles for a query and simplify each of them"""
+        return self.simplify_articles(query, self.fetch_articles(query), simplification_level, glossary)
+    
+    def fetch_articles(self, query):
+        """Fetch news articles from all sources at once, merged and de-duplicated"""
+        completed = sorted(self.iter_articles(query), key=lambda item: item[0])
+        return [article for _, article in completed]
+    
+    def search_titles(self, query, simplification_level='basic', glossary=None):
+        """Degraded search: the source listings simplified as they are, without downloading the articles"""
+        articles = self.sources.fetch(query, time.monotonic() + Config.LISTING_DEADLINE)
+        return self.simplify_articles(query, articles, simplification_level, glossary)
+    
+    def iter_search(self, query, simplification_level='basic', glossary=None):
+        """Yield (position, simplified article) in the order they become ready"""
+        for position, article in self.iter_articles(query):
+            try:
+                yield position, self.simplify_article(article, simplification_level, glossary=glossary)
+            except Exception as e:
+                logger.error(f"Error processing article: {str(e)}")
+    
+    def simplify_articles(self, query, articles, simplification_level='basic', glossary=None):
+        """Build the search response for already fetched articles"""
         if not articles:
-            return jsonify({
+            return {
                 'articles': [],
                 'message': 'No articles found for this query'
-            })
+            }
         
-        # Process and simplify articles
+        # Process and simplify articles, scoring the whole page at once
+        articles = articles[:Config.MAX_ARTICLES]
+        texts = [self._article_text(article) for article in articles]
+        try:
+            analyses = run_cpu_bound(
+                self.analyze_many, [full_text for _, _, full_text in texts], simplification_level,
+                [title for title, _, _ in texts], glossary
+            )
+        except Exception as e:
+            # Analyze article by article instead, so one bad article is skipped rather than failing the page
+            logger.error(f"Batch analysis error: {str(e)}")
+            analyses = [None] * len(articles)
         simplified_articles = []
         
-        for article in articles[:10]:  # Limit to 10 articles
+        for article, analysis in zip(articles, analyses):
             try:
-                title = article.get('title', '')
-                description = article.get('description', '')
-                content = article.get('content', description)
-                
-                # Combine title and content for analysis
-                full_text = f"{title}. {content}" if content else title
-                
-                # Detect jargon
-                detected_jargon = news_simplifier.detect_financial_jargon(full_text)
-                
-                # Simplify text
-                simplified_result = news_simplifier.simplify_text(full_text, simplification_level)
-                
-                # Calculate metrics
-                complexity = news_simplifier.calculate_complexity(full_text, len(detected_jargon))
-                readability_score = news_simplifier.calculate_readability_score(simplified_result['text'])
-                
-                # Generate insights
-                insights = news_simplifier.generate_insights(full_text, detected_jargon)
-                
-                simplified_articles.append({
-                    'original': {
-                        'title': title,
-                        'description': description,
-                        'url': article.get('url', ''),
-                        'source': article.get('source', {}).get('name', 'Unknown'),
-                        'publishedAt': article.get('publishedAt', ''),
-                        'content': full_text
-                    },
-                    'simplified': {
-                        'title': news_simplifier.simplify_text(title, simplification_level)['text'],
-                        'content': simplified_result['text']
-                    },
-                    'analysis': {
-                        'jargon_detected': detected_jargon,
-                        'jargon_count': len(detected_jargon),
-                        'complexity': complexity,
-                        'readability_score': readability_score,
-                        'insights': insights,
-                        'replacements': simplified_result['replacements']
-                    }
-                })
-                
+                simplified_articles.append(self.simplify_article(article, simplification_level, analysis, glossary))
             except Exception as e:
                 logger.error(f"Error processing article: {str(e)}")
                 continue
         
-        return jsonify({
+        return self.search_response(query, simplified_articles, simplification_level)
+    
+    def search_response(self, query, simplified_articles, simplification_level):
+        """Wrap simplified articles in the /api/search-news response shape"""
+        return {
             'articles': simplified_articles,
             'total_found': len(simplified_articles),
             'query': query,
             'simplification_level': simplification_level
-        })
+        }
+    
+    def _article_text(self, article):
+        """(title, description, text to analyze) of a fetched article"""
+        # Sources may send null for any of these
+        title = article.get('title') or ''
+        description = article.get('description') or ''
+        content = article.get('content', description) or ''
         
+        # Combine title and content for analysis
+        full_text = f"{title}. {content}" if content else title
+        return title, description, full_text
+    
+    def simplify_article(self, article, simplification_level='basic', analysis=None, glossary=None):
+        """Simplify and analyze one fetched article (analysis may be passed in when already computed)"""
+        title, description, full_text = self._article_text(article)
+        
+        if analysis is None:
+            analysis = run_cpu_bound(self.analyze, full_text, simplification_level, title=title, glossary=glossary)
+        
+        return {
+            'original': {
+                'title': title,
+                'description': description,
+                'url': article.get('url', ''),
+                'source': article.get('source', {}).get('name', 'Unknown'),
+                'publishedAt': article.get('publishedAt', ''),
+                'content': full_text
+            },
+            'simplified': {
+                'title': analysis['simplified_title'],
+                'content': analysis['simplified_text'],
+                'spans': analysis.get('simplified_spans')
+            },
+            'analysis': {
+                'jargon_detected': analysis['jargon_detected'],
+                'jargon_count': analysis['jargon_count'],
+                'complexity': analysis['complexity'],
+                'readability_score': analysis['readability_score'],
+                'insights': analysis['insights'],
+                'replacements': analysis['replacements']
+            }
+        }
+
+class TrendingPrefetcher:
+    """Keeps the search results for trending topics warm in the shared SEARCH_CACHE"""
+    
+    def __init__(self, simplifier, topics, interval, jitter, lock_path):
+        self.simplifier = simplifier
+        self.topics = topics
+        self.interval = interval
+        self.jitter = jitter
+        self.lock_path = lock_path
+        self.digests = {}
+        self.results = {}
+        self.pid = None
+        self.lock = threading.Lock()
+    
+    def ensure_started(self):
+        """Start the refresh thread once per process (threads do not survive fork)"""
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid != os.getpid():
+                self.pid = os.getpid()
+                threading.Thread(target=self._run, name='trending-prefetch', daemon=True).start()
+    
+    def _run(self):
+        # Jitter keeps workers (and restarts) from refreshing in lockstep
+        time.sleep(random.uniform(0, self.interval * self.jitter))
+        while True:
+            try:
+                self.refresh_if_due()
+            except Exception as e:
+                logger.error(f"Trending prefetch error: {str(e)}")
+            time.sleep(self.interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+    
+    def refresh_if_due(self):
+        """Refresh unless another worker holds the lease or just refreshed"""
+        with open(self.lock_path, 'a+') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            
+            lock_file.seek(0)
+            last_refresh = float(lock_file.read() or 0)
+            if time.time() - last_refresh < self.interval / 2:
+                return False
+            
+            self.refresh()
+            
+            lock_file.seek(0)
+            lock_file.truncate()
+            lock_file.write(str(time.time()))
+        return True
+    
+    def refresh(self):
+        """Fetch every topic at once and re-simplify the ones whose articles changed"""
+        glossary = GLOSSARIES.get()
+        # Each topic's scrape stops at FETCH_DEADLINE, so a refresh takes about one deadline, not one per topic
+        with ThreadPoolExecutor(max_workers=len(self.topics), thread_name_prefix='prefetch') as pool:
+            for future in [pool.submit(self.refresh_topic, topic, glossary) for topic in self.topics]:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Trending prefetch error: {str(e)}")
+    
+    def refresh_topic(self, topic, glossary):
+        articles = self.simplifier.fetch_articles(topic)
+        if not articles:
+            return
+        
+        # A new glossary version changes the simplified text too
+        digest = hashlib.sha1(json.dumps(
+            [glossary.version] + [(a.get('url'), a.get('title'), a.get('content')) for a in articles[:Config.MAX_ARTICLES]]
+        ).encode()).hexdigest()
+        
+        if digest != self.digests.get(topic):
+            self.results[topic] = {
+                level: self.simplifier.simplify_articles(topic, articles, level, glossary)
+                for level in SIMPLIFICATION_LEVELS
+            }
+            self.digests[topic] = digest
+        
+        for level, result in self.results[topic].items():
+            if result['articles']:
+                store_search(search_cache_key(topic, level, glossary), result)
+
+# Initialize the news simplifier
+news_simplifier = NewsSimplifier()
+trending_prefetcher = TrendingPrefetcher(
+    news_simplifier, TRENDING_TOPICS, Config.PREFETCH_INTERVAL, Config.PREFETCH_JITTER, Config.PREFETCH_LOCK_PATH
+)
+if Config.PREFETCH_ENABLED and not Config.SHARED_CACHE_PATH:
+    # Each worker would scrape every topic into memory only it can see
+    logger.warning("PREFETCH_TRENDING=1 needs CACHE_DB to share the prefetched results, trending prefetch is off")
+    Config.PREFETCH_ENABLED = False
+
+def warm_up():
+    """Load the default glossary and the heavy libraries in the gunicorn master, before it forks the workers"""
+    import bs4
+    import lxml.etree
+    import numpy
+    
+    text_metrics.hyphenator()
+    glossary = GLOSSARIES.get()
+    logger.info(f"Warmed up: glossary {Config.DEFAULT_LOCALE}/{Config.DEFAULT_DOMAIN} "
+                f"version {glossary.version}, {len(glossary)} terms")
+
+@app.before_request
+def start_background_jobs():
+    if Config.PREFETCH_ENABLED:
+        trending_prefetcher.ensure_started()
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_timing(response):
+    start = g.pop('request_start', None)
+    if start is not None and request.endpoint not in ('metrics', 'health'):
+        METRICS.observe('request', time.perf_counter() - start, source=request.endpoint or '')
+    
+    timings = g.pop('server_timing', None)
+    if timings:
+        response.headers['Server-Timing'] = ', '.join(
+            f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items()
+        )
+    return response
+
+def check_rate_limit(endpoint_class):
+    """Raise Shed (429) when this request's client is over its rate for endpoint_class"""
+    limiter = RATE_LIMITERS.get(endpoint_class)
+    if not Config.ADMISSION_CONTROL or limiter is None:
+        return
+    wait = limiter.take(request.remote_addr or '')
+    if wait:
+        raise Shed(f"Too many {endpoint_class} requests from {request.remote_addr}", 429, wait)
+
+def request_deadline(endpoint_class):
+    """time.monotonic() by which this request should be answered, or None for no limit"""
+    budget = ADMISSION[endpoint_class].deadline
+    requested = request.headers.get('X-Request-Timeout', type=float)
+    if requested is not None and requested > 0:
+        budget = requested if budget is None else min(budget, requested)
+    return None if budget is None else time.monotonic() + budget
+
+def flight_wait(deadline):
+    """Seconds to wait for an identical search in progress, ending no later than the request's deadline"""
+    if deadline is None:
+        return Config.SEARCH_WAIT_TIMEOUT
+    return max(0, min(Config.SEARCH_WAIT_TIMEOUT, deadline - time.monotonic()))
+
+def admit(endpoint_class, deadline):
+    """Take a slot of endpoint_class's AdmissionController; returns the function giving it back"""
+    if not Config.ADMISSION_CONTROL:
+        return lambda: None
+    controller = ADMISSION[endpoint_class]
+    return functools.partial(controller.release, controller.acquire(deadline))
+
+@contextmanager
+def admitted(endpoint_class, deadline):
+    release = admit(endpoint_class, deadline)
+    try:
+        yield
+    finally:
+        release()
+
+def shed_response(shed):
+    """429 or 503 with Retry-After, for a request refused by admission control"""
+    retry_after = max(1, math.ceil(shed.retry_after))
+    message = 'Too many requests, please slow down' if shed.status == 429 else 'Server busy, please try again shortly'
+    response = jsonify({'error': message, 'retry_after': retry_after})
+    response.status_code = shed.status
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+COMPRESSED_MIMETYPES = ('application/json', 'application/x-ndjson')
+
+def accepted_encoding():
+    """'br' or 'gzip', whichever the client accepts (brotli preferred when installed), or None"""
+    if brotli is not None and request.accept_encodings['br']:
+        return 'br'
+    if request.accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def compresses_response():
+    """Whether compress_response() will compress this request's response, if it is large enough"""
+    return Config.COMPRESS_RESPONSES and accepted_encoding() is not None
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.BROTLI_QUALITY)
+    compressor = zlib.compressobj(Config.GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip header and trailer
+    return compressor.compress(data) + compressor.flush()
+
+def compress_stream(chunks, encoding):
+    """Compress a streamed response, flushed after every chunk so each NDJSON frame can be decoded on arrival"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=Config.BROTLI_QUALITY)
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(Config.GZIP_LEVEL, zlib.DEFLATED, 31)
+        process, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    try:
+        for chunk in chunks:
+            yield process(chunk.encode() if isinstance(chunk, str) else chunk) + flush()
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+@app.after_request
+def compress_response(response):
+    """gzip or brotli for JSON and NDJSON responses, when the client accepts it"""
+    if (not Config.COMPRESS_RESPONSES or response.mimetype not in COMPRESSED_MIMETYPES
+            or response.direct_passthrough or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = accepted_encoding()
+    if encoding is None:
+        return response
+    
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+    else:
+        data = response.get_data()
+        if len(data) < Config.COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.route('/')
+def index():
+    """Main page"""
+    return render_template('news_simplifier.html')
+
+@app.route('/api/search-news', methods=['POST'])
+def search_news():
+    """Search for news articles and return simplified versions, degraded ones when the search is shed"""
+    try:
+        check_rate_limit('search')
+        data = request.get_json()
+        query = data.get('query', '').strip()
+        simplification_level = data.get('level', 'basic')
+        
+        if not query:
+            return jsonify({'error': 'Query is required'}), 400
+        
+        glossary = GLOSSARIES.get(data.get('locale'), data.get('domain'))
+        response_format, fields = response_options(data)
+        spans = not compresses_response()
+        deadline = request_deadline('search')
+        
+        try:
+            if data.get('stream'):
+                return stream_search(query, simplification_level, glossary, response_format, fields, spans, deadline)
+            result = cached_search(query, simplification_level, glossary, deadline)
+        except Shed as e:
+            result = degraded_search(query, simplification_level, glossary, e)
+            if data.get('stream'):
+                return Response(result_frames(result, response_format, fields, spans), mimetype='application/x-ndjson')
+        
+        return jsonify(encode_search(result, response_format, fields, spans))
+        
+    except Shed as e:
+        return shed_response(e)
+    except (GlossaryNotFound, ResponseFormatError) as e:
+        return jsonify({'error': str(e)}), 400
+    except TimeoutError as e:
+        logger.error(f"Search error: {str(e)}")
+        return jsonify({'error': 'Search timed out, please try again'}), 504
     except Exception as e:
         logger.error(f"Search error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+def store_search(cache_key, result):
+    SEARCH_CACHE.set(cache_key, result)
+    LAST_SEARCHES.set(cache_key, result)
+
+def cached_search(query, simplification_level, glossary, deadline=None):
+    """The cached result, or one search shared by every identical request arriving meanwhile"""
+    cache_key = search_cache_key(query, simplification_level, glossary)
+    result = SEARCH_CACHE.get(cache_key)
+    if result is not None:
+        return result
+    
+    def search():
+        if SEARCH_FLIGHTS.lease_path:
+            # The worker that held the lease before may have cached it
+            result = SEARCH_CACHE.get(cache_key)
+            if result is not None:
+                return result
+        
+        with admitted('search', deadline):
+            logger.info(f"Searching news for query: {query}")
+            result = news_simplifier.search(query, simplification_level, glossary)
+        if result['articles']:
+            store_search(cache_key, result)
+        return result
+    
+    return SEARCH_FLIGHTS.do(cache_key, search, flight_wait(deadline))
+
+def degraded_search(query, simplification_level, glossary, shed):
+    """The last result of a shed search, or its listings simplified as they are; raises shed when neither exists"""
+    if not Config.DEGRADED_SEARCH:
+        raise shed
+    
+    result = LAST_SEARCHES.get(search_cache_key(query, simplification_level, glossary))
+    if result is not None:
+        return {**result, 'degraded': 'stale'}
+    
+    try:
+        with admitted('titles', request_deadline('titles')):
+            logger.info(f"Title-only search for query: {query}")
+            result = news_simplifier.search_titles(query, simplification_level, glossary)
+    except Shed:
+        raise shed
+    if not result['articles']:
+        raise shed
+    return {**result, 'degraded': 'titles_only'}
+
+def ndjson_frame(**data):
+    return app.json.dumps_bytes(data) + b'\n'
+
+def summary_frame(result):
+    return ndjson_frame(type='summary', **{key: value for key, value in result.items() if key != 'articles'})
+
+def result_frames(result, response_format='full', fields=None, spans=True):
+    """NDJSON frames of a finished search result"""
+    for article in result['articles']:
+        yield ndjson_frame(type='article', article=encode_article(article, response_format, fields, spans))
+    yield summary_frame(result)
+
+def stream_search(query, simplification_level, glossary, response_format='full', fields=None, spans=True,
+                  deadline=None):
+    """NDJSON response: each article as soon as it is simplified, then a summary; raises Shed before sending anything"""
+    cache_key = search_cache_key(query, simplification_level, glossary)
+    result = SEARCH_CACHE.get(cache_key)
+    
+    # A leading stream sends its own articles as they come and hands the
+    # page-ordered result to identical searches waiting on it. It coalesces
+    # within this worker only; the lease across workers is taken in do().
+    call, leader = SEARCH_FLIGHTS.join(cache_key) if result is None else (None, False)
+    release = None
+    if leader:
+        try:
+            release = admit('search', deadline)
+        except Shed as e:
+            SEARCH_FLIGHTS.finish(cache_key, call, error=e)
+            raise
+    
+    def frames():
+        try:
+            if not leader:
+                found = result if result is not None else SEARCH_FLIGHTS.wait(call, flight_wait(deadline))
+                yield from result_frames(found, response_format, fields, spans)
+                return
+            
+            logger.info(f"Streaming news for query: {query}")
+            completed = []
+            for position, article in news_simplifier.iter_search(query, simplification_level, glossary):
+                completed.append((position, article))
+                yield ndjson_frame(type='article', article=encode_article(article, response_format, fields, spans))
+            
+            if completed:
+                # Cached in page order, as a non-streaming search would return it
+                simplified_articles = [article for _, article in sorted(completed, key=lambda item: item[0])]
+                found = news_simplifier.search_response(query, simplified_articles, simplification_level)
+                store_search(cache_key, found)
+            else:
+                found = {'articles': [], 'message': 'No articles found for this query'}
+            SEARCH_FLIGHTS.finish(cache_key, call, found)
+            yield summary_frame(found)
+            
+        except Exception as e:
+            if leader:
+                SEARCH_FLIGHTS.finish(cache_key, call, error=e)
+            logger.error(f"Search stream error: {str(e)}")
+            yield ndjson_frame(type='error', error='Internal server error')
+    
+    def close():
+        # A client that disconnects mid-stream must not leave the waiters hanging
+        SEARCH_FLIGHTS.finish(cache_key, call, error=RuntimeError('The streamed search was abandoned'))
+        release()
+    
+    response = Response(frames(), mimetype='application/x-ndjson')
+    if leader:
+        # The slot is held until the last frame is sent
+        response.call_on_close(close)
+    return response
+
 @app.route('/api/simplify-text', methods=['POST'])
 def simplify_custom_text():
     """Simplify custom text provided by user"""
     try:
+        check_rate_limit('simplify')
         data = request.get_json()
         text = data.get('text', '').strip()
         level = data.get('level', 'basic')
@@ -487,59 +2166,101 @@ def simplify_custom_text():
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        if len(text) > 10000:
-            return jsonify({'error': 'Text too long (max 10,000 characters)'}), 400
-        
-        # Detect jargon
-        detected_jargon = news_simplifier.detect_financial_jargon(text)
+        if len(text) > Config.MAX_TEXT_LENGTH:
+            return jsonify({'error': f'Text too long (max {Config.MAX_TEXT_LENGTH:,} characters)'}), 400
         
-        # Simplify text
-        simplified_result = news_simplifier.simplify_text(text, level)
+        glossary = GLOSSARIES.get(data.get('locale'), data.get('domain'))
+        response_format, fields = response_options(data)
+        with admitted('simplify', request_deadline('simplify')):
+            analysis = run_cpu_bound(news_simplifier.analyze, text, level, glossary=glossary)
         
-        # Calculate metrics
-        complexity = news_simplifier.calculate_complexity(text, len(detected_jargon))
-        readability_score = news_simplifier.calculate_readability_score(simplified_result['text'])
-        
-        # Generate insights
-        insights = news_simplifier.generate_insights(text, detected_jargon)
-        
-        return jsonify({
-            'original_text': text,
-            'simplified_text': simplified_result['text'],
-            'jargon_detected': detected_jargon,
-            'jargon_count': len(detected_jargon),
-            'complexity': complexity,
-            'readability_score': readability_score,
-            'insights': insights,
-            'replacements': simplified_result['replacements']
-        })
+        return jsonify(encode_text_result(text, analysis, response_format, fields))
         
+    except Shed as e:
+        return shed_response(e)
+    except (GlossaryNotFound, ResponseFormatError) as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Text simplification error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/simplify-batch', methods=['POST'])
+def simplify_batch():
+    """Convenience wrapper simplifying JSONL lines one by one in this worker; archives go through batch_simplify.py"""
+    level = request.args.get('level', 'basic')
+    try:
+        check_rate_limit('batch')
+        glossary = GLOSSARIES.get(request.args.get('locale'), request.args.get('domain'))
+        release = admit('batch', request_deadline('batch'))
+    except Shed as e:
+        return shed_response(e)
+    except GlossaryNotFound as e:
+        return jsonify({'error': str(e)}), 400
+    
+    def results():
+        for line in request.stream:
+            if line.strip():
+                result = run_cpu_bound(news_simplifier.simplify_record, line, level, Config.MAX_TEXT_LENGTH, glossary)
+                yield app.json.dumps_bytes(result) + b'\n'
+    
+    response = Response(stream_with_context(results()), mimetype='application/x-ndjson')
+    response.call_on_close(release)
+    return response
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Liveness check for the load balancer"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics for this worker"""
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Hit/miss counters for each cache layer, and how many calls were coalesced"""
+    stats = {cache.name: cache.stats() for cache in (SEARCH_CACHE, ARTICLE_CACHE, ANALYSIS_CACHE)}
+    if ARTICLE_STORE is not None:
+        stats['article_store'] = ARTICLE_STORE.stats()
+    stats['single_flight'] = {flights.name: flights.stats() for flights in (SEARCH_FLIGHTS, FETCH_FLIGHTS)}
+    return jsonify(stats)
+
+@app.route('/api/admission-stats', methods=['GET'])
+def get_admission_stats():
+    """Running, queued and shed requests per endpoint class, and rate-limited clients"""
+    return jsonify({
+        'enabled': Config.ADMISSION_CONTROL,
+        'classes': {name: controller.stats() for name, controller in ADMISSION.items()},
+        'rate_limits': {name: limiter.stats() for name, limiter in RATE_LIMITERS.items()}
+    })
+
+@app.route('/api/source-stats', methods=['GET'])
+def get_source_stats():
+    """Circuit breaker state, latency and hedging counters for each news source"""
+    return jsonify(news_simplifier.sources.stats())
+
+@app.route('/api/glossaries', methods=['GET'])
+def get_glossaries():
+    """Available glossaries with the version and term count currently loaded"""
+    glossaries = []
+    for locale, domain in GLOSSARIES.available():
+        try:
+            glossary = GLOSSARIES.get(locale, domain)
+        except Exception as e:
+            logger.error(f"Glossary error ({locale}/{domain}): {str(e)}")
+            continue
+        glossaries.append({'locale': locale, 'domain': domain, 'version': glossary.version, 'terms': len(glossary)})
+    
+    return jsonify({
+        'default': {'locale': GLOSSARIES.default_locale, 'domain': GLOSSARIES.default_domain},
+        'glossaries': glossaries
+    })
+
 @app.route('/api/trending-topics', methods=['GET'])
 def get_trending_topics():
     """Get trending financial topics"""
-    trending_topics = [
-        'Stock Market India',
-        'Sensex',
-        'Nifty 50',
-        'RBI Policy',
-        'Indian Economy',
-        'Cryptocurrency India',
-        'Mutual Funds',
-        'IPO India',
-        'Banking Sector',
-        'IT Stocks',
-        'Auto Sector',
-        'Real Estate India',
-        'Gold Prices India',
-        'Rupee Exchange Rate',
-        'GST Updates'
-    ]
-    
-    return jsonify({'trending_topics': trending_topics})
+    return jsonify({'trending_topics': TRENDING_TOPICS})
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
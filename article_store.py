@@ -0,0 +1,210 @@
+"""Persistent store of extracted article text, shared by every worker on the host
+
+Articles are appended to one data file as records of a fixed header followed
+by the UTF-8 text:
+
+    magic, URL key, content key, stored at, text offset, text length
+
+The URL key and content key are 16-byte BLAKE2b digests of the URL and the
+text. A URL whose text is already stored (syndicated or re-fetched articles)
+gets a header only, pointing at the earlier copy. The header of each record
+is the index: a process walks them once when it opens the file and then
+only the records appended since, keeping a dict from URL key to header
+offset. Reads go through mmap, so every worker shares the operating
+system's page cache instead of holding its own copy.
+
+Writers append under an exclusive lock on <path>.lock. Past max_bytes the
+file is compacted: expired and replaced records are dropped, then the
+oldest articles, until it is back under half of max_bytes, and the
+rewritten file is renamed over the old one. Other processes notice the new
+file the next time they miss and reopen it; until then their mapping of the
+old file stays valid.
+"""
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ART1'
+HEADER = struct.Struct('<4s16s16sdQI')
+COMPACT_TARGET = 0.5  # Fraction of max_bytes left after compaction
+
+def digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+class ArticleStore:
+    """Append-only, content-addressed article text store read through mmap"""
+    
+    def __init__(self, path, max_bytes, ttl):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.pid = None
+        self.fd = None
+        self.map = None
+        self.inode = None
+        self.scanned = 0  # File offset up to which headers are indexed
+        self.urls = {}  # URL key -> header offset
+        self.texts = {}  # Content key -> (text offset, length)
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.compactions = 0
+    
+    def _open(self):
+        # Descriptors and mappings must not cross a fork, so each worker opens its own
+        if self.fd is not None:
+            os.close(self.fd)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        self.inode = os.fstat(self.fd).st_ino
+        self.map = None
+        self.scanned = 0
+        self.urls = {}
+        self.texts = {}
+        self.pid = os.getpid()
+    
+    def _refresh(self):
+        """Pick up a compacted file and index the records appended since the last call"""
+        if self.pid != os.getpid():
+            self._open()
+        try:
+            if os.stat(self.path).st_ino != self.inode:
+                self._open()
+        except FileNotFoundError:
+            self._open()
+        
+        size = os.fstat(self.fd).st_size
+        if size <= self.scanned:
+            return
+        if self.map is None or len(self.map) < size:
+            # Readers holding the old mapping keep using it; it is freed with its last reference
+            self.map = mmap.mmap(self.fd, size, access=mmap.ACCESS_READ)
+        
+        data = self.map
+        position = self.scanned
+        while position + HEADER.size <= size:
+            magic, url_key, content_key, _, text_offset, length = HEADER.unpack_from(data, position)
+            end = position + HEADER.size
+            if text_offset == end:
+                end += length
+            if magic != MAGIC or end > size:
+                break  # A record still being written, or the torn tail of a crashed writer
+            self.urls[url_key] = position
+            self.texts[content_key] = (text_offset, length)
+            position = end
+        self.scanned = position
+    
+    def _lookup(self, url_key):
+        position = self.urls.get(url_key)
+        if position is None:
+            return None
+        data = self.map
+        _, _, _, stored_at, text_offset, length = HEADER.unpack_from(data, position)
+        return stored_at, data[text_offset:text_offset + length]
+    
+    def get(self, url):
+        """The stored text for url, or None when missing or older than ttl"""
+        url_key = digest(url.encode())
+        with self.lock:
+            if self.pid != os.getpid():
+                self._refresh()
+            entry = self._lookup(url_key)
+            if entry is None or entry[0] + self.ttl < time.time():
+                # Another worker may have stored it since
+                self._refresh()
+                entry = self._lookup(url_key)
+        
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, text = entry
+        if stored_at + self.ttl < time.time():
+            self.expired += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text.decode('utf-8')
+    
+    def set(self, url, text):
+        url_key = digest(url.encode())
+        data = text.encode('utf-8')
+        content_key = digest(data)
+        
+        with self.lock, open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._refresh()
+            # Drop a torn tail so the new record starts on a record boundary
+            if os.fstat(self.fd).st_size > self.scanned:
+                os.truncate(self.path, self.scanned)
+            
+            stored_at = time.time()
+            if content_key in self.texts:
+                text_offset, length = self.texts[content_key]
+                record = HEADER.pack(MAGIC, url_key, content_key, stored_at, text_offset, length)
+            else:
+                record = HEADER.pack(MAGIC, url_key, content_key, stored_at, self.scanned + HEADER.size, len(data)) + data
+            os.write(self.fd, record)
+            
+            if self.scanned + len(record) > self.max_bytes:
+                self._compact()
+    
+    def _compact(self):
+        """Rewrite the live records into a new file and rename it over the current one (lock held)"""
+        self._refresh()
+        data = self.map
+        cutoff = time.time() - self.ttl
+        
+        live = []
+        for position in self.urls.values():
+            _, url_key, content_key, stored_at, text_offset, length = HEADER.unpack_from(data, position)
+            if stored_at >= cutoff:
+                live.append((stored_at, url_key, content_key, text_offset, length))
+        
+        # Newest first until the target size, then written oldest first
+        live.sort(reverse=True)
+        budget = self.max_bytes * COMPACT_TARGET
+        kept = []
+        written = set()
+        for entry in live:
+            size = HEADER.size + (0 if entry[2] in written else entry[4])
+            if size > budget:
+                break
+            budget -= size
+            written.add(entry[2])
+            kept.append(entry)
+        
+        temporary = f"{self.path}.{os.getpid()}.compact"
+        with open(temporary, 'wb') as f:
+            texts = {}
+            for stored_at, url_key, content_key, text_offset, length in reversed(kept):
+                if content_key in texts:
+                    f.write(HEADER.pack(MAGIC, url_key, content_key, stored_at, texts[content_key], length))
+                else:
+                    texts[content_key] = f.tell() + HEADER.size
+                    f.write(HEADER.pack(MAGIC, url_key, content_key, stored_at, texts[content_key], length))
+                    f.write(data[text_offset:text_offset + length])
+        os.replace(temporary, self.path)
+        
+        self.compactions += 1
+        logger.info(f"Article store compacted: {len(kept)} of {len(self.urls)} articles kept")
+        self._open()
+        self._refresh()
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'entries': len(self.urls),
+            'bytes': self.scanned,
+            'compactions': self.compactions
+        }
@@ -0,0 +1,94 @@
+"""Bulk simplification of archived articles
+
+Reads JSONL from a file or stdin, one {"id": ..., "text": ..., "level": ...}
+object (or plain JSON string) per line, and writes one JSONL result per line
+in the same order. Texts are analyzed in chunks across a process pool with
+only a few chunks in flight, so memory stays flat however large the input.
+Analyses are cached in each worker process only, never in CACHE_DB, so a
+run does not evict the web workers' entries from the shared cache.
+
+    python batch_simplify.py archive.jsonl -o simplified.jsonl --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+os.environ.pop('CACHE_DB', None)
+
+from app import GLOSSARIES, news_simplifier
+
+def iter_chunks(lines, size):
+    """Group non-blank lines into lists of at most size"""
+    lines = (line for line in lines if line.strip())
+    while True:
+        chunk = list(islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+def simplify_chunk(lines, level, locale=None, domain=None):
+    """Runs in a worker process; returns (JSONL result, whether it failed) per line"""
+    glossary = GLOSSARIES.get(locale, domain)
+    return [
+        (json.dumps(result), 'error' in result)
+        for result in news_simplifier.simplify_records(lines, level, glossary=glossary)
+    ]
+
+def run_batch(lines, level='basic', workers=None, chunk_size=64, locale=None, domain=None):
+    """Yield (JSONL result, whether it failed) for every input line, in input order"""
+    workers = workers or os.cpu_count()
+    GLOSSARIES.get(locale, domain)  # Fail before starting workers if the glossary does not exist
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in iter_chunks(lines, chunk_size):
+            in_flight.append(pool.submit(simplify_chunk, chunk, level, locale, domain))
+            # Bound read-ahead so memory does not grow with the input
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def main():
+    parser = argparse.ArgumentParser(description='Simplify a JSONL file of financial texts')
+    parser.add_argument('input', nargs='?', default='-', help='JSONL input file (default: stdin)')
+    parser.add_argument('-o', '--output', default='-', help='JSONL output file (default: stdout)')
+    parser.add_argument('--level', default='basic', choices=['basic', 'detailed', 'expert'])
+    parser.add_argument('--locale', default=None, help='glossary locale (default: GLOSSARY_LOCALE or en)')
+    parser.add_argument('--domain', default=None, help='glossary domain (default: GLOSSARY_DOMAIN or finance)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='texts sent to a worker at a time')
+    args = parser.parse_args()
+    
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    
+    done = errors = 0
+    start = time.perf_counter()
+    try:
+        for result, failed in run_batch(source, args.level, args.workers, args.chunk_size, args.locale, args.domain):
+            target.write(result + '\n')
+            done += 1
+            if failed:
+                errors += 1
+            if done % 1000 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{done} documents, {done / elapsed:.1f} docs/s", file=sys.stderr)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed else 0
+    print(f"Done: {done} documents ({errors} errors) in {elapsed:.1f}s, {rate:.1f} docs/s", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Article store: hit latency, reopen time and per-worker memory
+
+Fills a store with synthetic articles built from the saved pages, then
+reports:
+
+    extract     extract_main_content() on a saved page, what a hit saves
+    get         ArticleStore.get() for a stored URL
+    reopen      a fresh process indexing the existing file (worker restart)
+    workers     N processes reading every article: hit rate and the private
+                memory each keeps afterwards, compared with each worker
+                holding the texts in a dict
+
+    python benchmarks/bench_article_store.py --articles 20000 --workers 4
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import extract_main_content
+from article_store import ArticleStore
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+def article_texts(count):
+    base = [extract_main_content(open(path, 'rb').read()) for path in sorted(glob.glob(os.path.join(PAGES_DIR, '*.html')))]
+    base = [text for text in base if text]
+    return {f'https://example.com/article/{i}': f"{base[i % len(base)]} Story {i}." for i in range(count)}
+
+def memory_kb(fields):
+    values = dict.fromkeys(fields, 0)
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            name = line.split(':')[0]
+            if name in values:
+                values[name] = int(line.split()[1])
+    return values
+
+def read_all(args):
+    """Runs in a worker process: read every URL, report hits and the memory kept afterwards"""
+    path, urls, use_store = args
+    before = memory_kb(['Private_Clean', 'Private_Dirty'])
+    hits = 0
+    if use_store:
+        store = ArticleStore(path, 1 << 40, 3600)
+        for url in urls:
+            hits += store.get(url) is not None
+    else:
+        # Every worker holding its own copy, like the in-process article cache
+        with open(path + '.texts', encoding='utf-8') as f:
+            held = dict(zip(urls, f.read().split('\0')))
+        for url in urls:
+            hits += held.get(url) is not None
+    after = memory_kb(['Private_Clean', 'Private_Dirty'])
+    private = (after['Private_Clean'] + after['Private_Dirty']) - (before['Private_Clean'] + before['Private_Dirty'])
+    return hits, private
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the mmap article store')
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    
+    texts = article_texts(args.articles)
+    urls = list(texts)
+    markup = open(os.path.join(PAGES_DIR, 'et_article.html'), 'rb').read()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'articles.dat')
+        store = ArticleStore(path, 1 << 40, 3600)
+        start = time.perf_counter()
+        for url, text in texts.items():
+            store.set(url, text)
+        fill = time.perf_counter() - start
+        size = os.path.getsize(path)
+        with open(path + '.texts', 'w', encoding='utf-8') as f:
+            f.write('\0'.join(texts.values()))
+        
+        extract = statistics.median(timed(lambda: extract_main_content(markup)) for _ in range(50))
+        get = statistics.median(timed(lambda url=url: store.get(url)) for url in urls[:5000])
+        reopen = statistics.median(timed(lambda: ArticleStore(path, 1 << 40, 3600).get(urls[0])) for _ in range(5))
+        
+        print(f"{args.articles} articles, store file {size / 2 ** 20:.1f} MB, filled in {fill:.2f} s")
+        print(f"extract_main_content  {extract * 1000:8.3f} ms per page")
+        print(f"store get (hit)       {get * 1000:8.3f} ms")
+        print(f"reopen and index      {reopen * 1000:8.1f} ms")
+        
+        for use_store in (False, True):
+            with multiprocessing.Pool(args.workers) as pool:
+                results = pool.map(read_all, [(path, urls, use_store)] * args.workers)
+            hits = sum(hits for hits, _ in results)
+            private = sum(private for _, private in results)
+            label = 'store (mmap)' if use_store else 'dict per worker'
+            print(f"{label:<18} {args.workers} workers: hit rate {hits / (len(urls) * args.workers):.0%}, "
+                  f"private memory {private / 1024:.1f} MB in total")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""analyze_many() against analyze() per text: identical results and time per page
+
+Builds documents from the fixture articles (whole articles, single
+sentences, shuffled words and jargon-heavy mixes, so every complexity
+branch is reached), checks that the batch results equal the per-text ones
+at every level, then times both for pages of several sizes.
+
+    python benchmarks/bench_batch_scoring.py
+"""
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import app
+import text_metrics
+
+ARTICLES = [json.loads(line) for line in open(os.path.join(BENCH_DIR, 'fixtures', 'articles.jsonl'), encoding='utf-8')]
+
+def documents(count, seed=11):
+    rng = random.Random(seed)
+    sentences = [s.strip() + '.' for article in ARTICLES for s in article['content'].split('.') if s.strip()]
+    jargon = [term for term, _, _ in app.GLOSSARIES.get().jargon.values()]
+    docs = []
+    while len(docs) < count:
+        kind = len(docs) % 4
+        if kind == 0:
+            article = rng.choice(ARTICLES)
+            docs.append(f"{article['title']}. {article['content']}")
+        elif kind == 1:
+            docs.append(' '.join(rng.sample(sentences, rng.randint(1, 3))))
+        elif kind == 2:
+            words = rng.choice(ARTICLES)['content'].split()
+            rng.shuffle(words)
+            docs.append(' '.join(words[:rng.randint(1, len(words))]))
+        else:
+            docs.append(' '.join(rng.choice(jargon + ['the', 'market', 'rose.']) for _ in range(rng.randint(1, 120))))
+    return docs
+
+def check_identical(docs):
+    simplifier = app.news_simplifier
+    mismatches = 0
+    assert len(docs) >= app.Config.VECTORIZE_MIN_TEXTS, 'too few documents to reach the NumPy path'
+    for level in app.SIMPLIFICATION_LEVELS:
+        app.ANALYSIS_CACHE.clear()
+        batch = simplifier.analyze_many(docs, level)
+        app.ANALYSIS_CACHE.clear()
+        for doc, result in zip(docs, batch):
+            if simplifier.analyze(doc, level) != result:
+                mismatches += 1
+    seen = {(r['complexity'], r['readability_score'] // 10) for r in simplifier.analyze_many(docs, 'basic')}
+    print(f"{len(docs) * len(app.SIMPLIFICATION_LEVELS)} results compared, {mismatches} differ "
+          f"({len(seen)} distinct complexity/readability buckets covered)")
+    return mismatches == 0
+
+def score_only(docs, rounds=20):
+    """Time just the scoring step, per text against as arrays"""
+    simplifier = app.news_simplifier
+    stats = [text_metrics.measure(doc) for doc in docs]
+    jargon = [simplifier.detect_financial_jargon(doc) for doc in docs]
+    jargon_counts = [len(j) for j in jargon]
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for s, n in zip(stats, jargon_counts):
+            simplifier._score_complexity(s, n)
+            simplifier._score_readability(s)
+    scalar = (time.perf_counter() - start) / rounds
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        arrays = {key: np.fromiter((s[key] for s in stats), dtype=np.int64, count=len(stats)) for key in text_metrics.COUNT_KEYS}
+        app.score_complexity_array(arrays, np.array(jargon_counts))
+        np.clip(np.rint(text_metrics.flesch_reading_ease_array(arrays)), 0, 100)
+    vectorized = (time.perf_counter() - start) / rounds
+    return scalar, vectorized
+
+def compare_speed(docs):
+    simplifier = app.news_simplifier
+    for size in (10, 100, 1000):
+        page = (docs * (size // len(docs) + 1))[:size]
+        app.ANALYSIS_CACHE.clear()
+        start = time.perf_counter()
+        for doc in page:
+            simplifier.analyze(doc, 'basic')
+        per_text = time.perf_counter() - start
+        
+        app.ANALYSIS_CACHE.clear()
+        start = time.perf_counter()
+        simplifier.analyze_many(page, 'basic')
+        batch = time.perf_counter() - start
+        
+        scalar, vectorized = score_only(page)
+        print(f"{size:>5} texts  analyze {per_text * 1000:8.1f} ms  analyze_many {batch * 1000:8.1f} ms  "
+              f"scoring alone {scalar * 1000:7.2f} ms -> {vectorized * 1000:6.2f} ms")
+
+if __name__ == '__main__':
+    docs = documents(400)
+    identical = check_identical(docs)
+    compare_speed(docs)
+    sys.exit(0 if identical else 1)
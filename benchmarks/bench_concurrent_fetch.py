@@ -0,0 +1,95 @@
+"""Concurrent article fetching against a local stub server
+
+Starts a stub HTTP server that answers article pages after a delay and
+counts connections and requests in flight, then checks that article bodies:
+
+    parallel    are downloaded concurrently, up to PER_HOST_CONCURRENCY at a time
+    deadline    come back partial, with empty content, when the deadline passes
+    pooled      reuse keep-alive connections instead of opening one per article
+    skipped     are not read when the page is not HTML or is above MAX_PAGE_BYTES
+
+Exits non-zero if any check fails.
+
+    python benchmarks/bench_concurrent_fetch.py --delay 0.5
+"""
+import argparse
+import os
+import sys
+import time
+
+from harness import HTML, REPO_DIR, read_page, start_stub
+
+PER_HOST_CONCURRENCY = 4
+
+os.environ.update(PER_HOST_CONCURRENCY=str(PER_HOST_CONCURRENCY), DOMAIN_MIN_INTERVAL='0')
+sys.path.insert(0, REPO_DIR)
+
+from app import Config, news_simplifier
+
+def article_site(delay):
+    """respond() for article pages after delay seconds, ten times that under /slow/, and PDF or oversized pages"""
+    article_page = read_page('et_article.html')
+    
+    def respond(path, stats):
+        time.sleep(delay * 10 if path.startswith('/slow/') else delay)
+        if path.startswith('/pdf/'):
+            return 200, 'application/pdf', b'%PDF-1.4' + b'\0' * 4096
+        if path.startswith('/huge/'):
+            return 200, HTML, b'<p>x</p>' * (Config.MAX_PAGE_BYTES // 8 + 1)
+        return 200, HTML, article_page
+    
+    return respond
+
+def fetch(urls, deadline_seconds):
+    """(seconds, contents in url order) for one iter_article_contents call"""
+    start = time.perf_counter()
+    contents = dict(news_simplifier.iter_article_contents(urls, time.monotonic() + deadline_seconds))
+    return time.perf_counter() - start, [contents[i] for i in range(len(urls))]
+
+def main():
+    parser = argparse.ArgumentParser(description='Check concurrent article fetching against a stub server')
+    parser.add_argument('--delay', type=float, default=0.5, help='stub response delay in seconds')
+    parser.add_argument('--articles', type=int, default=12)
+    args = parser.parse_args()
+    
+    base, stats = start_stub(article_site(args.delay))
+    failures = []
+    
+    def check(name, ok, detail):
+        print(f"{name:<10} {'ok' if ok else 'FAILED':<7} {detail}")
+        if not ok:
+            failures.append(name)
+    
+    # Parallel, capped per host. URLs are unique per check so nothing comes from the article cache.
+    rounds = -(-args.articles // PER_HOST_CONCURRENCY)
+    seconds, contents = fetch([f'{base}/a/{i}' for i in range(args.articles)], Config.FETCH_DEADLINE)
+    check('parallel', all(contents) and stats.max_in_flight == PER_HOST_CONCURRENCY
+          and seconds < args.delay * (rounds + 1),
+          f"{args.articles} articles in {seconds:.2f}s (sequential {args.articles * args.delay:.1f}s), "
+          f"at most {stats.max_in_flight} at once")
+    
+    # Pooled: all of the above went over the per-host keep-alive pool
+    check('pooled', len(stats.connections) <= PER_HOST_CONCURRENCY,
+          f"{stats.requests} requests over {len(stats.connections)} connections")
+    
+    # Deadline: fast articles come back, slow ones are given up on
+    stats.reset()
+    urls = [f'{base}/b/{i}' for i in range(2)] + [f'{base}/slow/{i}' for i in range(2)]
+    deadline = args.delay * 3
+    seconds, contents = fetch(urls, deadline)
+    check('deadline', seconds < deadline + args.delay and all(contents[:2]) and not any(contents[2:]),
+          f"returned after {seconds:.2f}s (deadline {deadline:.2f}s, slow pages take {args.delay * 10:.1f}s), "
+          f"{sum(1 for content in contents if content)} of {len(urls)} articles")
+    
+    # Skipped: non-HTML and oversized pages give empty content
+    stats.reset()
+    seconds, contents = fetch([f'{base}/pdf/1', f'{base}/huge/1', f'{base}/c/1'], Config.FETCH_DEADLINE)
+    check('skipped', not contents[0] and not contents[1] and contents[2],
+          f"pdf {len(contents[0])} chars, {Config.MAX_PAGE_BYTES // 1024 // 1024} MB+ page {len(contents[1])} chars, "
+          f"html {len(contents[2])} chars")
+    
+    if failures:
+        sys.exit(f"{len(failures)} check(s) failed: {', '.join(failures)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Article extraction: lxml streaming extractor against the old BeautifulSoup path
+
+Checks that both give identical text for every saved page in
+benchmarks/fixtures/pages and reports the time per page.
+
+    python benchmarks/bench_extract.py
+"""
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from app import extract_main_content
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+REPEATS = 20
+
+def legacy_extract(markup):
+    """The html.parser extractor extract_article_content used before"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    
+    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
+        element.decompose()
+    
+    content = ""
+    for selector in ['.story_content', '.articleBody', '.story-body', '.content', 'article', '.post-content']:
+        content_elem = soup.select_one(selector)
+        if content_elem:
+            content = content_elem.get_text(strip=True)
+            break
+    
+    if not content:
+        paragraphs = soup.find_all('p')
+        content = ' '.join([p.get_text(strip=True) for p in paragraphs])
+    
+    return content
+
+def best_time(func, markup):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(markup)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    failures = 0
+    print(f"{'page':<36} {'KB':>6} {'legacy ms':>10} {'lxml ms':>8} {'speedup':>8}  match")
+    for path in sorted(glob.glob(os.path.join(PAGES_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            markup = f.read()
+        
+        match = legacy_extract(markup) == extract_main_content(markup)
+        failures += not match
+        
+        legacy = best_time(legacy_extract, markup)
+        fast = best_time(extract_main_content, markup)
+        print(f"{os.path.basename(path):<36} {len(markup) / 1024:>6.1f} {legacy * 1000:>10.2f} "
+              f"{fast * 1000:>8.2f} {legacy / fast:>7.1f}x  {'yes' if match else 'NO'}")
+    
+    if failures:
+        sys.exit(f"{failures} page(s) extracted differently")
+
+if __name__ == '__main__':
+    main()
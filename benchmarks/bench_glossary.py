@@ -0,0 +1,147 @@
+"""Glossary load time, memory and scan speed against glossary size
+
+Writes synthetic glossaries of 1k, 10k and 50k terms as JSON, CSV and
+SQLite, then for each reports how long loading and compiling takes, the
+memory the compiled glossary holds (and the peak while building it) and
+articles scanned per second. Finishes by editing a glossary on disk and
+timing how long a GlossaryStore takes to serve the new version while
+other threads keep reading it.
+
+    python benchmarks/bench_glossary.py
+"""
+import csv
+import json
+import os
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from glossary import Glossary, GlossaryStore, read_glossary
+
+GLOSSARY_SIZES = [1000, 10000, 50000]
+ARTICLE_WORDS = 800
+REPEATS = 5
+
+def make_terms(size, rng):
+    """(jargon, phrases) of made-up one to three word terms"""
+    terms = {}
+    while len(terms) < size:
+        words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        terms[' '.join(words)] = f"explanation {len(terms)}"
+    pairs = list(terms.items())
+    split = size * 4 // 5
+    return pairs[:split], pairs[split:]
+
+def write_glossary(path, jargon, phrases):
+    extension = os.path.splitext(path)[1]
+    rows = [('jargon', term, text) for term, text in jargon] + [('phrase', term, text) for term, text in phrases]
+    if extension == '.json':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'jargon': dict(jargon), 'phrases': dict(phrases)}, f)
+    elif extension == '.csv':
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['kind', 'term', 'text'])
+            writer.writerows(rows)
+    else:
+        if os.path.exists(path):
+            os.remove(path)
+        db = sqlite3.connect(path)
+        db.execute('CREATE TABLE terms (kind TEXT, term TEXT, text TEXT)')
+        db.executemany('INSERT INTO terms VALUES (?, ?, ?)', rows)
+        db.commit()
+        db.close()
+
+def make_article(terms, rng):
+    filler = ['the', 'company', 'said', 'shares', 'rose', 'in', 'early', 'trade', 'on', 'monday']
+    words = [rng.choice(terms) if rng.random() < 0.05 else rng.choice(filler) for _ in range(ARTICLE_WORDS)]
+    return ' '.join(words) + '.'
+
+def best_time(func):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def load(path):
+    return Glossary(*read_glossary(path), 'bench')
+
+def bench_sizes(directory, rng):
+    print(f"{'terms':>8} {'format':>7} {'load ms':>9} {'held MB':>8} {'peak MB':>8} {'art/s':>8}")
+    for size in GLOSSARY_SIZES:
+        jargon, phrases = make_terms(size, rng)
+        text = make_article([term for term, _ in jargon + phrases], rng)
+        for extension in ('.json', '.csv', '.sqlite'):
+            path = os.path.join(directory, f'bench{extension}')
+            write_glossary(path, jargon, phrases)
+            
+            elapsed = best_time(lambda: load(path))
+            
+            tracemalloc.start()
+            glossary = load(path)
+            held, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            matcher = glossary.rewrite_matcher
+            scan = best_time(lambda: list(matcher.longest(matcher.scan(text))))
+            print(f"{size:>8} {extension[1:]:>7} {elapsed * 1000:>9.1f} {held / 2 ** 20:>8.1f} "
+                  f"{peak / 2 ** 20:>8.1f} {1 / scan:>8.1f}")
+
+def bench_reload(directory, rng):
+    """Edit a 50k-term glossary on disk and time until readers see the new version"""
+    jargon, phrases = make_terms(GLOSSARY_SIZES[-1], rng)
+    os.makedirs(os.path.join(directory, 'en'), exist_ok=True)
+    path = os.path.join(directory, 'en', 'finance.json')
+    write_glossary(path, jargon, phrases)
+    
+    store = GlossaryStore(directory, 'en', 'finance', check_interval=0.5)
+    old_version = store.get().version
+    
+    stop = threading.Event()
+    slowest = [0.0]
+    
+    def reader():
+        while not stop.is_set():
+            start = time.perf_counter()
+            store.get()
+            slowest[0] = max(slowest[0], time.perf_counter() - start)
+            time.sleep(0.001)  # Other request work
+    
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    
+    time.sleep(1)
+    slowest[0] = 0.0
+    # Written next to it and renamed, so the store never reads a half-written file
+    write_glossary(path + '.tmp.json', jargon + [('bench reload term', 'added')], phrases)
+    os.replace(path + '.tmp.json', path)
+    start = time.perf_counter()
+    while store.get().version == old_version:
+        time.sleep(0.01)
+    visible = time.perf_counter() - start
+    stop.set()
+    for thread in readers:
+        thread.join()
+    
+    print(f"\nReload of {GLOSSARY_SIZES[-1]} terms: new version served after {visible * 1000:.0f} ms "
+          f"(check interval {store.check_interval * 1000:.0f} ms), slowest reader get() {slowest[0] * 1000:.1f} ms")
+
+def main():
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        bench_sizes(directory, rng)
+        bench_reload(directory, rng)
+
+if __name__ == '__main__':
+    main()
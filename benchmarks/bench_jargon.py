@@ -0,0 +1,72 @@
+"""Jargon detection throughput against glossary size
+
+Compares the old per-term regex loop with the compiled TermMatcher.
+
+    python benchmarks/bench_jargon.py
+"""
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import GLOSSARIES
+from glossary import TermMatcher
+
+GLOSSARY_SIZES = [40, 400, 4000]
+ARTICLE_WORDS = 800
+REPEATS = 5
+
+def make_glossary(size, rng):
+    """Real jargon padded with made-up multi-word terms"""
+    terms = [term for term, _, _ in GLOSSARIES.get().jargon.values()]
+    while len(terms) < size:
+        words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        terms.append(' '.join(words))
+    return terms[:size]
+
+def make_article(terms, rng):
+    filler = ['the', 'company', 'said', 'shares', 'rose', 'in', 'early', 'trade', 'on', 'monday']
+    words = [rng.choice(terms) if rng.random() < 0.05 else rng.choice(filler) for _ in range(ARTICLE_WORDS)]
+    return ' '.join(words) + '.'
+
+def legacy_count(terms, text):
+    text_lower = text.lower()
+    counts = {}
+    for term in terms:
+        matches = re.findall(r'\b' + re.escape(term.lower()) + r'\b', text_lower)
+        if matches:
+            counts[term.lower()] = len(matches)
+    return counts
+
+def best_time(func):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    rng = random.Random(42)
+    print(f"{'terms':>8} {'build ms':>10} {'legacy art/s':>14} {'matcher art/s':>14} {'speedup':>8}")
+    for size in GLOSSARY_SIZES:
+        terms = make_glossary(size, rng)
+        text = make_article(terms, rng)
+        
+        start = time.perf_counter()
+        matcher = TermMatcher(terms)
+        build = time.perf_counter() - start
+        
+        assert matcher.count(matcher.scan(text.lower())) == legacy_count(terms, text)
+        
+        legacy = best_time(lambda: legacy_count(terms, text))
+        compiled = best_time(lambda: matcher.count(matcher.scan(text.lower())))
+        print(f"{size:>8} {build * 1000:>10.1f} {1 / legacy:>14.1f} {1 / compiled:>14.1f} {legacy / compiled:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
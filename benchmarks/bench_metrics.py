@@ -0,0 +1,113 @@
+"""text_metrics against textstat: score agreement and speed
+
+For every fixture article, simplified at each level, checks that
+text_metrics gives the same 0-100 readability score as textstat, both
+measured directly and derived from the original's counts with apply_edits.
+Then times textstat, a full text_metrics pass and the apply_edits path.
+
+    python benchmarks/bench_metrics.py
+"""
+import json
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import textstat
+
+import app
+import text_metrics
+
+ARTICLES = [json.loads(line) for line in open(os.path.join(BENCH_DIR, 'fixtures', 'articles.jsonl'), encoding='utf-8')]
+TEXTS = [f"{article['title']}. {article['content']}" for article in ARTICLES]
+
+def textstat_score(text):
+    return max(0, min(100, round(textstat.flesch_reading_ease(text))))
+
+def metrics_score(counts):
+    return max(0, min(100, round(text_metrics.flesch_reading_ease(counts))))
+
+def shuffled_variants(text, count, rng):
+    # Reordered words and sentence endings make texts the fixtures do not cover
+    words = text.split()
+    for _ in range(count):
+        rng.shuffle(words)
+        yield ' '.join(word + rng.choice(['', '', '', '.', ',', '!', ' -']) for word in words[:rng.randint(1, len(words))])
+
+def check_agreement():
+    simplifier = app.news_simplifier
+    rng = random.Random(7)
+    cases = list(TEXTS)
+    for text in TEXTS:
+        cases.extend(shuffled_variants(text, 20, rng))
+    
+    default_dense_edit_chars = text_metrics.DENSE_EDIT_CHARS
+    checked = 0
+    mismatches = 0
+    for text in cases:
+        counts = text_metrics.measure(text)
+        expected = textstat_score(text)
+        checked += 1
+        if metrics_score(counts) != expected:
+            mismatches += 1
+            print(f"measure mismatch: {text[:60]!r}")
+        
+        for level in app.SIMPLIFICATION_LEVELS:
+            rewritten = simplifier.simplify_text(text, level)
+            for dense_edit_chars in (0, default_dense_edit_chars):
+                # 0 forces the incremental path even for jargon-dense texts
+                text_metrics.DENSE_EDIT_CHARS = dense_edit_chars
+                derived = text_metrics.apply_edits(counts, text, rewritten['edits'])
+                checked += 1
+                if derived != text_metrics.measure(rewritten['text']) or metrics_score(derived) != textstat_score(rewritten['text']):
+                    mismatches += 1
+                    print(f"apply_edits mismatch ({level}): {text[:60]!r}")
+            text_metrics.DENSE_EDIT_CHARS = default_dense_edit_chars
+    print(f"{checked} scores checked, {mismatches} differ from textstat")
+    return mismatches == 0
+
+def timed(label, func, rounds=5):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"{label:<40} {elapsed * 1000:8.2f} ms per {len(TEXTS)} articles")
+    return elapsed
+
+def compare_speed():
+    simplifier = app.news_simplifier
+    rewritten = [simplifier.simplify_text(text, 'detailed') for text in TEXTS]
+    counts = [text_metrics.measure(text) for text in TEXTS]
+    rounds = iter(range(10 ** 9))
+    
+    def with_textstat():
+        # A fresh suffix per round keeps textstat's lru_cache out of the measurement
+        n = next(rounds)
+        for result in rewritten:
+            textstat.flesch_reading_ease(f"{result['text']} {n}")
+    
+    def with_measure():
+        for result in rewritten:
+            text_metrics.flesch_reading_ease(text_metrics.measure(result['text']))
+    
+    def with_apply_edits(keep_every):
+        # The fixtures are dense with jargon; keeping every n-th edit models lighter articles
+        def run():
+            for text, result, text_counts in zip(TEXTS, rewritten, counts):
+                text_metrics.flesch_reading_ease(text_metrics.apply_edits(text_counts, text, result['edits'][::keep_every]))
+        return run
+    
+    baseline = timed('textstat.flesch_reading_ease', with_textstat)
+    variants = [('text_metrics.measure', with_measure)]
+    variants += [(f'text_metrics.apply_edits (1/{n} of edits)', with_apply_edits(n)) for n in (1, 4, 16)]
+    for label, func in variants:
+        elapsed = timed(label, func)
+        print(f"{'':<40} {baseline / elapsed:8.1f}x faster")
+
+if __name__ == '__main__':
+    agreed = check_agreement()
+    compare_speed()
+    sys.exit(0 if agreed else 1)
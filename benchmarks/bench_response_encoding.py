@@ -0,0 +1,92 @@
+"""Response size and serialization time: full format against compact
+
+Builds a 10-article /api/search-news response and an /api/simplify-text
+response from the fixture articles and reports, for each:
+
+    full        the default format through the json module, as before
+    compact     format=compact with the fields the web page asks for, through
+                orjson; article text as spans, as sent uncompressed
+    no spans    the same with the simplified article text in full, as sent
+                to clients that accept gzip or brotli
+
+with the body size as sent, gzip- and brotli-compressed (brotli only when
+installed), and the time to serialize and to compress it.
+
+    python benchmarks/bench_response_encoding.py
+"""
+import json
+import os
+import statistics
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from app import Config, GLOSSARIES, encode_search, encode_text_result, news_simplifier
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'articles.jsonl')
+REPEATS = 200
+
+# Same lists as static/js/news_simplifier_app.js
+ARTICLE_FIELDS = [
+    'original.title', 'original.source', 'original.publishedAt', 'original.url', 'original.content',
+    'simplified.content',
+    'analysis.complexity', 'analysis.jargon_count', 'analysis.readability_score',
+    'analysis.jargon_detected', 'analysis.insights'
+]
+TEXT_FIELDS = ['complexity', 'jargon_count', 'readability_score', 'jargon_detected', 'insights', 'simplified_text']
+
+def json_module_dumps(obj):
+    """What Flask's default provider produced for jsonify()"""
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode()
+
+def median_time(func):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def gzip_bytes(data):
+    compressor = zlib.compressobj(Config.GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+def report(label, encode, dumps):
+    body = dumps(encode())
+    serialize = median_time(lambda: dumps(encode()))
+    gzip_time = median_time(lambda: gzip_bytes(body))
+    row = f"{label:<18} {len(body):>9,} {len(gzip_bytes(body)):>9,} "
+    if app_module.brotli is not None:
+        compressed = app_module.brotli.compress(body, quality=Config.BROTLI_QUALITY)
+        brotli_time = median_time(lambda: app_module.brotli.compress(body, quality=Config.BROTLI_QUALITY))
+        row += f"{len(compressed):>9,} "
+    else:
+        brotli_time = None
+        row += f"{'-':>9} "
+    row += f"{serialize * 1000:>11.3f} {gzip_time * 1000:>9.3f} "
+    row += f"{brotli_time * 1000:>9.3f}" if brotli_time is not None else f"{'-':>9}"
+    print(row)
+
+def main():
+    with open(FIXTURES, encoding='utf-8') as f:
+        articles = [json.loads(line) for line in f][:Config.MAX_ARTICLES]
+    glossary = GLOSSARIES.get()
+    search = news_simplifier.simplify_articles('Sensex', articles, 'basic', glossary)
+    text = articles[0]['content']
+    analysis = news_simplifier.analyze(text, 'basic', glossary=glossary)
+    
+    fast_dumps = app_module.app.json.dumps_bytes
+    print(f"orjson {'installed' if app_module.orjson is not None else 'not installed, json module used'}, "
+          f"brotli {'installed' if app_module.brotli is not None else 'not installed'}\n")
+    print(f"{'':<18} {'bytes':>9} {'gzip':>9} {'brotli':>9} {'encode ms':>11} {'gzip ms':>9} {'brotli ms':>9}")
+    report('search full', lambda: encode_search(search), json_module_dumps)
+    report('search compact', lambda: encode_search(search, 'compact', ARTICLE_FIELDS), fast_dumps)
+    report('search no spans', lambda: encode_search(search, 'compact', ARTICLE_FIELDS, spans=False), fast_dumps)
+    report('text full', lambda: encode_text_result(text, analysis), json_module_dumps)
+    report('text compact', lambda: encode_text_result(text, analysis, 'compact', TEXT_FIELDS), fast_dumps)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Multi-source fan-out against local stand-in news sites
+
+Four stub sites run on localhost: a fast one, one with a slow tail (every
+tenth listing stalls), one that always fails and one that hangs past the
+listing deadline. The script runs a series of searches and reports search
+latency percentiles, hedged requests and circuit breaker states, with and
+without hedging. It exits non-zero unless:
+
+    breakers    the failing and hanging sites end with their breaker open,
+                the working ones closed
+    hedging     once the breakers have opened, no search waits on a stalled
+                listing with hedging on (and some do with it off)
+    dedupe      every search returns each story once, though all sites list it
+
+    python benchmarks/bench_sources.py --searches 60
+"""
+import argparse
+import itertools
+import logging
+import sys
+import time
+
+from harness import HTML, REPO_DIR, read_page, start_stub
+
+sys.path.insert(0, REPO_DIR)
+
+import app
+
+logging.getLogger('app').setLevel(logging.CRITICAL)
+
+ARTICLE_PAGE = read_page('et_article.html')
+
+def listing_page(site, count=6):
+    # Every site lists the same stories, so merging has duplicates to remove
+    items = ''.join(
+        f'<div class="story"><a href="/{site}/story-{n}.cms?utm_source=feed">Markets rally as story {n} unfolds</a></div>'
+        for n in range(count)
+    )
+    return f'<html><body>{items}</body></html>'.encode()
+
+def start_site(behaviour, stall=2.0):
+    calls = itertools.count()
+    
+    def respond(path, stats):
+        if not path.startswith('/topic/'):
+            return 200, HTML, ARTICLE_PAGE
+        n = next(calls)
+        if behaviour == 'failing':
+            return 503, HTML, b''
+        if behaviour == 'hanging' or (behaviour == 'slow_tail' and n % 10 == 9):
+            time.sleep(stall)
+        else:
+            time.sleep(0.02)
+        return 200, HTML, listing_page(behaviour)
+    
+    return start_stub(respond)[0]
+
+def run(searches, hedging, stall):
+    app.Config.NEWS_SOURCES = {
+        behaviour: (behaviour, start_site(behaviour, stall), '/topic/{query}', 'div.story')
+        for behaviour in ('fast', 'slow_tail', 'failing', 'hanging')
+    }
+    app.Config.HEDGE_MIN_SAMPLES = 5 if hedging else 10 ** 9
+    app.Config.LISTING_DEADLINE = stall / 2
+    
+    http = app.PooledHTTPClient(per_host_concurrency=8, min_interval=0)
+    pool = app.ThreadPoolExecutor(max_workers=32)
+    sources = [app.SiteSource(name) for name in app.Config.NEWS_SOURCES]
+    fetcher = app.MultiSourceFetcher(sources, http, pool)
+    
+    latencies = []
+    counts = []
+    duplicates = 0
+    for i in range(searches):
+        start = time.perf_counter()
+        articles = fetcher.fetch(f'query {i}', time.monotonic() + app.Config.LISTING_DEADLINE)
+        latencies.append(time.perf_counter() - start)
+        counts.append(len(articles))
+        stories = [article['title'] for article in articles]
+        duplicates += len(stories) - len(set(stories))
+    
+    # The first searches wait on the hanging site until its breaker opens
+    stalled = sum(1 for seconds in latencies[app.Config.BREAKER_FAILURES:] if seconds > stall / 4)
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"hedging {'on ' if hedging else 'off'}  p50 {pick(0.5):7.1f} ms  p90 {pick(0.9):7.1f} ms  "
+          f"p99 {pick(0.99):7.1f} ms  articles/search {min(counts)}-{max(counts)}")
+    stats = fetcher.stats()
+    for name, source_stats in stats.items():
+        print(f"    {name:<10} breaker {source_stats['breaker']:<9} hedged {source_stats['hedged_requests']}")
+    print(f"    {stalled} searches stalled after the breakers opened, {duplicates} duplicate stories")
+    pool.shutdown(wait=False, cancel_futures=True)
+    return {'stats': stats, 'stalled': stalled, 'duplicates': duplicates, 'counts': counts}
+
+def main():
+    parser = argparse.ArgumentParser(description='Fan-out, hedging and circuit breakers against stand-in sources')
+    parser.add_argument('--searches', type=int, default=60)
+    parser.add_argument('--stall', type=float, default=2.0, help='seconds a stalled listing takes')
+    args = parser.parse_args()
+    
+    unhedged = run(args.searches, False, args.stall)
+    hedged = run(args.searches, True, args.stall)
+    
+    failures = []
+    for result in (unhedged, hedged):
+        breakers = {name: source_stats['breaker'] for name, source_stats in result['stats'].items()}
+        if breakers != {'fast': 'closed', 'slow_tail': 'closed', 'failing': 'open', 'hanging': 'open'}:
+            failures.append(f"breaker states {breakers}")
+        if result['duplicates'] or min(result['counts']) != 6:
+            failures.append(f"{result['duplicates']} duplicate stories, {min(result['counts'])}-{max(result['counts'])} per search")
+    if any(source_stats['hedged_requests'] for source_stats in unhedged['stats'].values()):
+        failures.append('hedged requests with hedging off')
+    if not hedged['stats']['slow_tail']['hedged_requests']:
+        failures.append('the slow tail was never hedged')
+    if hedged['stalled'] or not unhedged['stalled']:
+        failures.append(f"stalled searches: {unhedged['stalled']} without hedging, {hedged['stalled']} with")
+    
+    if failures:
+        sys.exit('Failed: ' + '; '.join(failures))
+
+if __name__ == '__main__':
+    main()
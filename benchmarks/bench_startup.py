@@ -0,0 +1,122 @@
+"""Import time and cold start of the app, optionally against an earlier revision
+
+For the working tree (and, with --compare, a git revision checked out in a
+temporary worktree) it reports:
+
+    import      python -c "import app", wall time including the interpreter
+    first       import plus one /api/simplify-text request through the test client
+    boot        gunicorn with --workers N until /health answers
+    first req   the first /api/simplify-text answered by that gunicorn
+    PSS         proportional set size of the gunicorn master and workers together
+
+    python benchmarks/bench_startup.py --compare HEAD~1
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from harness import REPO_DIR, start_gunicorn, stop
+
+FIRST_REQUEST = '''
+import app
+response = app.app.test_client().post('/api/simplify-text', json={'text': 'The IPO lifted market cap and dividend yield.'})
+assert response.status_code == 200
+'''
+
+def timed_run(tree, code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=tree, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def pss_kb(pid):
+    """PSS of pid and its children, from /proc (Linux only)"""
+    total = 0
+    pids = [pid]
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            pids += [int(child) for child in f.read().split()]
+        for each in pids:
+            with open(f'/proc/{each}/smaps_rollup') as f:
+                for line in f:
+                    if line.startswith('Pss:'):
+                        total += int(line.split()[1])
+    except OSError:
+        return None
+    return total
+
+def gunicorn_cold_start(tree, workers):
+    start = time.perf_counter()
+    process, base = start_gunicorn(workers=workers, cwd=tree)
+    try:
+        boot = time.perf_counter() - start
+        
+        request = urllib.request.Request(
+            base + '/api/simplify-text', headers={'Content-Type': 'application/json'},
+            data=json.dumps({'text': 'The IPO lifted market cap and dividend yield.'}).encode()
+        )
+        start = time.perf_counter()
+        urllib.request.urlopen(request, timeout=60).read()
+        first_request = time.perf_counter() - start
+        
+        # Let every worker finish booting before measuring memory
+        time.sleep(2)
+        return boot, first_request, pss_kb(process.pid)
+    finally:
+        stop(process)
+
+def measure(tree, runs, workers):
+    imports = [timed_run(tree, 'import app') for _ in range(runs)]
+    firsts = [timed_run(tree, FIRST_REQUEST) for _ in range(runs)]
+    boots, first_requests, pss = zip(*[gunicorn_cold_start(tree, workers) for _ in range(max(1, runs // 2))])
+    pss = [value for value in pss if value is not None]
+    return {
+        'import_ms': round(statistics.median(imports) * 1000, 1),
+        'first_request_ms': round(statistics.median(firsts) * 1000, 1),
+        'boot_ms': round(statistics.median(boots) * 1000, 1),
+        'boot_first_request_ms': round(statistics.median(first_requests) * 1000, 1),
+        'pss_mb': round(statistics.median(pss) / 1024, 1) if pss else None
+    }
+
+def print_row(label, result):
+    print(f"{label:<14} {result['import_ms']:>10.1f} {result['first_request_ms']:>10.1f} {result['boot_ms']:>10.1f} "
+          f"{result['boot_first_request_ms']:>12.1f} {result['pss_mb'] or float('nan'):>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure app import time and gunicorn cold start')
+    parser.add_argument('--compare', help='git revision to measure as well, e.g. HEAD~1')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+    
+    trees = {'working tree': REPO_DIR}
+    worktree = None
+    if args.compare:
+        worktree = tempfile.mkdtemp(prefix='bench-startup-')
+        subprocess.run(['git', 'worktree', 'add', '--detach', worktree, args.compare], cwd=REPO_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        trees = {args.compare: worktree, **trees}
+    
+    results = {}
+    try:
+        print(f"{'':<14} {'import ms':>10} {'first ms':>10} {'boot ms':>10} {'boot+req ms':>12} {'PSS MB':>9}")
+        for label, tree in trees.items():
+            results[label] = measure(tree, args.runs, args.workers)
+            print_row(label, results[label])
+    finally:
+        if worktree:
+            subprocess.run(['git', 'worktree', 'remove', '--force', worktree], cwd=REPO_DIR,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'runs': args.runs, 'workers': args.workers, 'results': results}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""Stub upstream servers, a gunicorn runner and client helpers shared by the benchmarks and load tests"""
+import collections
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(REPO_DIR, 'benchmarks', 'fixtures', 'pages')
+HTML = 'text/html; charset=utf-8'
+
+def read_page(name):
+    with open(os.path.join(PAGES_DIR, name), 'rb') as f:
+        return f.read()
+
+class StubStats:
+    """Requests a stub server received: per kind ('topic' or 'article'), connections and concurrency"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self.lock:
+            self.counts = collections.Counter()
+            self.connections = set()
+            self.in_flight = 0
+            self.max_in_flight = 0
+    
+    @property
+    def requests(self):
+        return sum(self.counts.values())
+
+def start_stub(respond, queue_size=1024):
+    """Serve respond(path, stats) -> (status, content type, body), which may sleep, on a local port; returns (base URL, stats)"""
+    stats = StubStats()
+    
+    class Stub(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def log_message(self, *args):
+            pass
+        
+        def do_GET(self):
+            with stats.lock:
+                stats.counts['topic' if self.path.startswith('/topic/') else 'article'] += 1
+                stats.connections.add(self.client_address)
+                stats.in_flight += 1
+                stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+            try:
+                status, content_type, body = respond(self.path, stats)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                pass  # The client gave up waiting
+            finally:
+                with stats.lock:
+                    stats.in_flight -= 1
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Stub)
+    server.daemon_threads = True
+    server.request_queue_size = queue_size
+    server.handle_error = lambda request, client_address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', stats
+
+def news_site(delay=0, fail=False, unique_links=False):
+    """respond() for an Economic Times stand-in answering after delay seconds, every topic page linking new articles with unique_links"""
+    topic_page = read_page('et_topic_sensex.html')
+    article_page = read_page('et_article.html')
+    listings = itertools.count()
+    
+    def respond(path, stats):
+        time.sleep(delay)
+        if not path.startswith('/topic/'):
+            body = article_page
+        elif unique_links:
+            body = topic_page.replace(b'href="/markets', b'href="/%d/markets' % next(listings))
+        else:
+            body = topic_page
+        return 500 if fail else 200, HTML, body
+    
+    return respond
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def app_env(upstream, **overrides):
+    """Environment for an app scraping only the stub at upstream, without politeness delays or admission control"""
+    env = dict(
+        os.environ,
+        ECONOMIC_TIMES_URL=upstream,
+        SOURCES='economic_times',
+        # The stub stands in for many article hosts, so per-host politeness is lifted
+        PER_HOST_CONCURRENCY='1000',
+        DOMAIN_MIN_INTERVAL='0',
+        # Every client is this one address; load_test_admission.py turns it back on
+        ADMISSION_CONTROL='0'
+    )
+    env.update(overrides)
+    return env
+
+def start_gunicorn(env=None, workers=1, cwd=REPO_DIR, timeout=120):
+    """gunicorn serving app:app on a free port, returned as (process, base URL) once /health answers"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+         '--timeout', str(timeout), '--backlog', '2048', 'app:app'],
+        cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base = f'http://127.0.0.1:{port}'
+    for _ in range(1500):
+        try:
+            urllib.request.urlopen(base + '/health', timeout=1)
+            return process, base
+        except OSError:
+            time.sleep(0.02)
+    process.kill()
+    raise RuntimeError(f'gunicorn in {cwd} did not start')
+
+def stop(process):
+    process.terminate()
+    process.wait()
+
+def post_json(url, payload, headers=None, timeout=120):
+    """(seconds, status or None, body) of a JSON POST; status is None when the connection failed"""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json', **(headers or {})})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+        return time.perf_counter() - start, response.status, body
+    except urllib.error.HTTPError as e:
+        return time.perf_counter() - start, e.code, b''
+    except OSError:
+        return time.perf_counter() - start, None, b''
+
+@contextmanager
+def probing(url, interval=0.1, timeout=60):
+    """Collect GET latencies of url every interval seconds during the with-block (timeout when it fails)"""
+    latencies = []
+    stopped = threading.Event()
+    
+    def probe():
+        while not stopped.is_set():
+            start = time.perf_counter()
+            try:
+                urllib.request.urlopen(url, timeout=timeout).read()
+                latencies.append(time.perf_counter() - start)
+            except OSError:
+                latencies.append(timeout)
+            time.sleep(interval)
+    
+    thread = threading.Thread(target=probe, daemon=True)
+    thread.start()
+    try:
+        yield latencies
+    finally:
+        stopped.set()
+        thread.join()
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def latency_summary(values):
+    """'p50 … p99 … ms' of latencies in seconds"""
+    if not values:
+        return 'p50       - p99       - ms'
+    ordered = sorted(values)
+    return f"p50 {percentile(ordered, 0.5) * 1000:>7.0f} p99 {percentile(ordered, 0.99) * 1000:>7.0f} ms"
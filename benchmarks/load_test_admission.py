@@ -0,0 +1,92 @@
+"""Load test: admission control and load shedding under a burst of searches
+
+Starts a local stub upstream that answers topic and article pages after a
+delay, with different article links in every topic page, then runs one
+gevent gunicorn worker with ADMISSION_CONTROL off and on. Each client
+searches its own topic (no coalescing, no cache hits), all starting
+together, from its own address (X-Forwarded-For, TRUSTED_PROXIES=1) with an
+X-Request-Timeout deadline, while a probe measures /api/trending-topics.
+Reported per mode:
+
+    full        searches answered in full, and their p50/p99 latency
+    degraded    answered with a title-only or earlier result instead
+    shed        answered 503 (429 when rate limited), and how fast
+    late        answered in full but after the client's deadline
+    probe       /api/trending-topics latency during the burst
+
+Then one client sends --burst searches at once to check its rate limit.
+
+    python benchmarks/load_test_admission.py --clients 200 --delay 1
+"""
+import argparse
+import collections
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from harness import app_env, latency_summary, news_site, post_json, probing, start_gunicorn, start_stub, stop
+
+def search(base, query, client, request_timeout):
+    """(seconds, status, degraded) of one search"""
+    seconds, status, body = post_json(
+        base + '/api/search-news', {'query': query, 'level': 'basic'},
+        headers={'X-Forwarded-For': client, 'X-Request-Timeout': str(request_timeout)}, timeout=300
+    )
+    return seconds, status, json.loads(body).get('degraded') if status == 200 else None
+
+def run_mode(mode, upstream, stats, args):
+    env = app_env(upstream, SERVING_MODE='async', TRUSTED_PROXIES='1', ADMISSION_CONTROL='1' if mode == 'on' else '0')
+    process, base = start_gunicorn(env, timeout=300)
+    try:
+        stats.reset()
+        barrier = threading.Barrier(args.clients)
+        
+        def client(index):
+            barrier.wait()
+            return search(base, f'Sensex {mode} {index}', f'10.1.{index // 250}.{index % 250}', args.request_timeout)
+        
+        with probing(base + '/api/trending-topics') as probes:
+            with ThreadPoolExecutor(max_workers=args.clients) as pool:
+                outcomes = list(pool.map(client, range(args.clients)))
+        
+        # One client over its rate limit
+        with ThreadPoolExecutor(max_workers=args.burst) as pool:
+            burst = list(pool.map(lambda i: search(base, f'Burst {mode} {i}', '10.9.9.9', args.request_timeout),
+                                  range(args.burst)))
+    finally:
+        stop(process)
+    
+    full = [seconds for seconds, status, degraded in outcomes if status == 200 and not degraded]
+    return {
+        'full': full,
+        'late': sum(1 for seconds in full if seconds > args.request_timeout),
+        'degraded': collections.Counter(degraded for _, status, degraded in outcomes if status == 200 and degraded),
+        'shed': [seconds for seconds, status, _ in outcomes if status in (429, 503)],
+        'statuses': collections.Counter(status for _, status, _ in outcomes),
+        'probes': probes,
+        'upstream': dict(stats.counts),
+        'burst': collections.Counter(status for _, status, _ in burst)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare a search burst with admission control off and on')
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=1.0, help='upstream response delay in seconds')
+    parser.add_argument('--request-timeout', type=float, default=10, help='X-Request-Timeout sent by clients')
+    parser.add_argument('--burst', type=int, default=30, help='searches sent at once by one client')
+    parser.add_argument('--modes', default='off,on')
+    args = parser.parse_args()
+    
+    upstream, stats = start_stub(news_site(args.delay, unique_links=True), queue_size=2048)
+    
+    for mode in args.modes.split(','):
+        r = run_mode(mode, upstream, stats, args)
+        print(f"admission {mode}: statuses {dict(r['statuses'])}, upstream requests {r['upstream']}")
+        print(f"  full      {len(r['full']):>4}  {latency_summary(r['full'])}  ({r['late']} after the deadline)")
+        print(f"  degraded  {sum(r['degraded'].values()):>4}  {dict(r['degraded'])}")
+        print(f"  shed      {len(r['shed']):>4}  {latency_summary(r['shed'])}")
+        print(f"  probe     {len(r['probes']):>4}  {latency_summary(r['probes'])}")
+        print(f"  burst of {args.burst} from one client: {dict(r['burst'])}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Load test: upstream calls when many clients search the same topic at once
+
+Starts a local stub upstream that counts topic-page and article requests
+and answers after a delay, then runs gunicorn (gevent workers) three ways:
+
+    off          SINGLE_FLIGHT=0, every request does its own search
+    worker       identical searches and downloads coalesce within a worker
+    host         also across workers: SINGLE_FLIGHT_LEASE with CACHE_DB and ARTICLE_STORE
+
+All clients send the same search together, the way a trending topic gets
+clicked when news breaks, first as plain JSON requests and then streamed
+(stream: true, as the web page sends them). Every topic page links to
+articles of its own, so the streamed burst finds no article cached by the
+first one. --fail makes the stub answer 500 to check that a failure reaches
+every waiter as the normal empty result.
+
+    python benchmarks/load_test_coalescing.py --clients 100 --workers 4
+"""
+import argparse
+import collections
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from harness import app_env, news_site, post_json, start_gunicorn, start_stub, stop
+
+def search(base, query, stream=False):
+    """(seconds, status, articles received) of one search"""
+    seconds, status, body = post_json(base + '/api/search-news', {'query': query, 'level': 'basic', 'stream': stream})
+    if status != 200:
+        return seconds, status, 0
+    if stream:
+        frames = [json.loads(line) for line in body.splitlines() if line.strip()]
+        return seconds, status, sum(1 for frame in frames if frame['type'] == 'article')
+    return seconds, status, len(json.loads(body).get('articles', []))
+
+def run_mode(mode, upstream, stats, args, directory):
+    env = app_env(upstream, SERVING_MODE='async', SINGLE_FLIGHT='0' if mode == 'off' else '1')
+    if mode == 'host':
+        env.update(
+            SINGLE_FLIGHT_LEASE=os.path.join(directory, f'{mode}.lease'),
+            CACHE_DB=os.path.join(directory, f'{mode}-cache.db'),
+            ARTICLE_STORE=os.path.join(directory, f'{mode}-articles.dat')
+        )
+    
+    process, base = start_gunicorn(env, args.workers)
+    try:
+        return {stream: burst(base, f'Sensex {mode} {stream}', stream, stats, args) for stream in (False, True)}
+    finally:
+        stop(process)
+
+def burst(base, query, stream, stats, args):
+    """Upstream requests, statuses and latency when every client sends query at once"""
+    stats.reset()
+    barrier = threading.Barrier(args.clients)
+    
+    def client(_):
+        barrier.wait()
+        return search(base, query, stream)
+    
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        outcomes = list(pool.map(client, range(args.clients)))
+    
+    latencies = sorted(latency for latency, _, _ in outcomes)
+    return {
+        'topic_requests': stats.counts['topic'],
+        'article_requests': stats.counts['article'],
+        'statuses': dict(collections.Counter(status for _, status, _ in outcomes)),
+        'articles_per_response': dict(collections.Counter(found for _, _, found in outcomes)),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1),
+        'max_ms': round(latencies[-1] * 1000, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Count upstream calls for identical concurrent searches')
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--delay', type=float, default=0.3, help='upstream response delay in seconds')
+    parser.add_argument('--fail', action='store_true', help='upstream answers 500 to everything')
+    parser.add_argument('--modes', default='off,worker,host')
+    args = parser.parse_args()
+    
+    upstream, stats = start_stub(news_site(args.delay, args.fail, unique_links=True))
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in args.modes.split(','):
+            for stream, r in run_mode(mode, upstream, stats, args, directory).items():
+                print(f"{mode:<7} {'stream' if stream else 'json':<7} topic requests {r['topic_requests']:>4}  "
+                      f"article requests {r['article_requests']:>5}  p50 {r['p50_ms']:>8.1f} ms  "
+                      f"max {r['max_ms']:>8.1f} ms  statuses {r['statuses']}  articles/response {r['articles_per_response']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Load test: sync against async (gevent) gunicorn workers
+
+Starts a local stub upstream that answers topic and article pages after a
+fixed delay, then runs one gunicorn worker per mode against it. Concurrent
+clients send cache-missing /api/search-news requests while a probe measures
+/api/trending-topics latency.
+
+    python benchmarks/load_test_serving.py --clients 50 --searches 2
+"""
+import argparse
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness import app_env, news_site, percentile, post_json, probing, start_gunicorn, start_stub, stop
+
+def percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {'p50_ms': None, 'p99_ms': None}
+    return {'p50_ms': round(percentile(values, 0.5) * 1000, 1), 'p99_ms': round(percentile(values, 0.99) * 1000, 1)}
+
+def run_mode(mode, upstream, clients, searches):
+    process, base = start_gunicorn(app_env(upstream, SERVING_MODE=mode))
+    try:
+        def client(index):
+            # Distinct queries so every search misses the cache
+            return [post_json(base + '/api/search-news', {'query': f'{mode} load {index} {n}', 'level': 'basic'})[:2]
+                    for n in range(searches)]
+        
+        with probing(base + '/api/trending-topics') as probes:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                outcomes = [result for results in pool.map(client, range(clients)) for result in results]
+            wall = time.perf_counter() - start
+        
+        latencies = [latency for latency, status in outcomes if status == 200]
+        return {
+            'searches': len(outcomes),
+            'errors': len(outcomes) - len(latencies),
+            'searches_per_sec': round(len(latencies) / wall, 2),
+            'search': percentiles(latencies),
+            'mean_search_ms': round(statistics.mean(latencies) * 1000, 1) if latencies else None,
+            'trending_topics': percentiles(probes),
+            'wall_s': round(wall, 2)
+        }
+    finally:
+        stop(process)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sync and async gunicorn workers under search load')
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--searches', type=int, default=2, help='searches per client')
+    parser.add_argument('--delay', type=float, default=0.3, help='upstream response delay in seconds')
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+    
+    upstream, _ = start_stub(news_site(args.delay))
+    
+    results = {}
+    for mode in args.modes.split(','):
+        results[mode] = run_mode(mode, upstream, args.clients, args.searches)
+        r = results[mode]
+        print(f"{mode:<6} {r['searches_per_sec']:>7.2f} searches/s  search p50 {r['search']['p50_ms']} ms "
+              f"p99 {r['search']['p99_ms']} ms  trending p50 {r['trending_topics']['p50_ms']} ms "
+              f"p99 {r['trending_topics']['p99_ms']} ms  errors {r['errors']}/{r['searches']}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'clients': args.clients, 'searches': args.searches, 'delay': args.delay, 'results': results}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
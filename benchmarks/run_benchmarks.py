@@ -0,0 +1,206 @@
+"""Reproducible benchmark suite for the simplification pipeline
+
+Runs offline: the recorded articles in fixtures/articles.jsonl and the saved
+pages in fixtures/pages are served by a local stub standing in for NewsAPI
+and Economic Times. For every pipeline function and API route it reports
+throughput, p50/p99 latency and peak traced memory, single-threaded and
+under concurrent load.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json   # exits 1 on regression
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from harness import HTML, PAGES_DIR, REPO_DIR, percentile, start_stub
+
+FIXTURES_DIR = os.path.join(REPO_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, REPO_DIR)
+
+import app
+
+ARTICLES = [json.loads(line) for line in open(os.path.join(FIXTURES_DIR, 'articles.jsonl'), encoding='utf-8')]
+PAGES = {}
+for path in sorted(glob.glob(os.path.join(PAGES_DIR, '*.html'))):
+    with open(path, 'rb') as f:
+        PAGES[os.path.basename(path)] = f.read()
+ARTICLE_PAGES = [markup for name, markup in PAGES.items() if 'topic' not in name]
+TEXTS = [f"{article['title']}. {article['content']}" for article in ARTICLES]
+
+def respond(path, stats):
+    """NewsAPI, Economic Times topic pages and article pages from the fixtures"""
+    path = urlparse(path).path
+    if path == '/v2/everything':
+        return 200, 'application/json', json.dumps({'status': 'ok', 'articles': ARTICLES[:20]}).encode()
+    if path.startswith('/topic/'):
+        return 200, HTML, PAGES['et_topic_sensex.html']
+    number = int(re.sub(r'\D', '', path) or 0)
+    return 200, 'text/html', ARTICLE_PAGES[number % len(ARTICLE_PAGES)]
+
+def serve_fixtures():
+    base, _ = start_stub(respond)
+    
+    # Every scraped site points at the stub; only the Economic Times topic path returns a listing
+    app.Config.NEWS_SOURCES = {name: (display, base, path, selector)
+                               for name, (display, _, path, selector) in app.Config.NEWS_SOURCES.items()}
+    app.Config.NEWSAPI_URL = base + '/v2/everything'
+    app.news_simplifier.http.rate_limiter.min_interval = 0
+    # Every request comes from one client as fast as it can; measure the pipeline, not the rate limits
+    app.Config.ADMISSION_CONTROL = False
+
+def clear_caches():
+    for cache in (app.SEARCH_CACHE, app.ARTICLE_CACHE, app.ANALYSIS_CACHE):
+        cache.clear()
+
+def measure(operation, iterations, threads):
+    """Run operation(i) iterations times over threads and summarize the latencies"""
+    def timed(i):
+        start = time.perf_counter()
+        operation(i)
+        return time.perf_counter() - start
+    
+    operation(0)  # Warm up imports, pools and connections
+    
+    start = time.perf_counter()
+    if threads == 1:
+        latencies = [timed(i) for i in range(iterations)]
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies = list(pool.map(timed, range(iterations)))
+    wall = time.perf_counter() - start
+    
+    # Memory is traced in a separate pass; tracemalloc would distort the timings
+    tracemalloc.start()
+    for i in range(min(iterations, 10)):
+        operation(i)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    latencies.sort()
+    return {
+        'ops_per_sec': round(iterations / wall, 2),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+        'peak_kb': round(peak / 1024, 1)
+    }
+
+def benchmarks():
+    """name -> (operation(i), iterations at scale 1)"""
+    simplifier = app.news_simplifier
+    client = app.app.test_client()
+    # A unique suffix per call keeps textstat's internal lru_cache from serving repeats
+    calls = itertools.count()
+    text = lambda i: f"{TEXTS[i % len(TEXTS)]} Ref {next(calls)}."
+    
+    def analyze(i):
+        clear_caches()
+        simplifier.analyze(text(i), 'detailed')
+    
+    def simplify_route(i):
+        clear_caches()
+        response = client.post('/api/simplify-text', json={'text': text(i)[:10000], 'level': 'basic'})
+        assert response.status_code == 200
+    
+    def search_route(newsapi):
+        def run(i):
+            clear_caches()
+            app.Config.NEWSAPI_KEY = 'stub-key' if newsapi else 'your_newsapi_key_here'
+            response = client.post('/api/search-news', json={'query': f'Sensex {i}', 'level': 'basic'})
+            assert response.get_json()['total_found'] > 0
+        return run
+    
+    def cached_search_route(i):
+        app.Config.NEWSAPI_KEY = 'stub-key'
+        client.post('/api/search-news', json={'query': 'Sensex', 'level': 'basic'})
+    
+    return {
+        'detect_financial_jargon': (lambda i: simplifier.detect_financial_jargon(text(i)), 400),
+        'simplify_text': (lambda i: simplifier.simplify_text(text(i), 'detailed'), 400),
+        'calculate_complexity': (lambda i: simplifier.calculate_complexity(text(i), 5), 400),
+        'calculate_readability_score': (lambda i: simplifier.calculate_readability_score(text(i)), 200),
+        'analyze': (analyze, 200),
+        'extract_main_content': (lambda i: app.extract_main_content(ARTICLE_PAGES[i % len(ARTICLE_PAGES)]), 200),
+        'route:/api/simplify-text': (simplify_route, 200),
+        'route:/api/search-news[newsapi]': (search_route(True), 20),
+        'route:/api/search-news[scrape]': (search_route(False), 20),
+        'route:/api/search-news[cached]': (cached_search_route, 200),
+    }
+
+def compare(results, baseline, tolerance):
+    """List the results that got slower than baseline by more than tolerance"""
+    regressions = []
+    for name, modes in results.items():
+        for mode, current in modes.items():
+            previous = baseline.get('results', {}).get(name, {}).get(mode)
+            if not previous:
+                continue
+            if current['ops_per_sec'] < previous['ops_per_sec'] * (1 - tolerance):
+                regressions.append(f"{name} [{mode}] throughput {previous['ops_per_sec']} -> {current['ops_per_sec']} ops/s")
+            if current['p99_ms'] > previous['p99_ms'] * (1 + tolerance):
+                regressions.append(f"{name} [{mode}] p99 {previous['p99_ms']} -> {current['p99_ms']} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the News Simplifier pipeline offline')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against a previous --output file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown fraction (default 0.25)')
+    parser.add_argument('--threads', type=int, default=8, help='threads for the concurrent run')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply iteration counts')
+    parser.add_argument('--only', help='regex selecting benchmark names')
+    args = parser.parse_args()
+    
+    serve_fixtures()
+    results = {}
+    
+    for name, (operation, iterations) in benchmarks().items():
+        if args.only and not re.search(args.only, name):
+            continue
+        iterations = max(2, int(iterations * args.scale))
+        results[name] = {
+            'single': measure(operation, iterations, 1),
+            f'concurrent_{args.threads}': measure(operation, iterations, args.threads)
+        }
+        for mode, result in results[name].items():
+            print(f"{name:<36} {mode:<14} {result['ops_per_sec']:>10.1f} ops/s  "
+                  f"p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms  peak {result['peak_kb']:>8.1f} KB")
+    
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'threads': args.threads,
+            'scale': args.scale
+        },
+        'results': results
+    }
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print('\nREGRESSIONS:', *regressions, sep='\n  ', file=sys.stderr)
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+if __name__ == '__main__':
+    main()
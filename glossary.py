@@ -0,0 +1,287 @@
+"""Glossaries of jargon and complex phrases, loaded from files and reloaded when they change
+
+Glossaries live under a directory as <locale>/<domain>.json, .csv or
+.sqlite, e.g. glossaries/en/finance.json:
+
+    JSON    {"jargon": {"term": "explanation", ...}, "phrases": {"phrase": "replacement", ...}}
+    CSV     columns kind,term,text with kind "jargon" or "phrase"
+    SQLite  table terms(kind, term, text), read in rowid order
+
+Terms are matched case-insensitively; a later term with the same lowercase
+spelling replaces an earlier one. Each loaded file gets a version (a hash
+of its content) and compiled glossaries are cached by version.
+
+A changed file is reloaded while requests keep using the old glossary, which
+stays in place if the new file fails to load. Replace files by renaming a
+complete new file over them, or a reload can pick up a half-written one.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class GlossaryNotFound(LookupError):
+    pass
+
+def fold(text):
+    """Lowercase text without changing its length, so match positions stay valid"""
+    folded = text.lower()
+    if len(folded) != len(text):
+        # A few characters lowercase to two (e.g. 'İ'); keep their first
+        folded = ''.join(char.lower()[0] for char in text)
+    return folded
+
+class TermMatcher:
+    """Single-pass, case-insensitive matcher for a fixed set of terms, indexed by their first run of word or non-word characters"""
+    
+    RUNS = re.compile(r'\w+|\W+')
+    WORD_CHAR = re.compile(r'\w')
+    
+    def __init__(self, terms):
+        self.keys = {sys.intern(fold(term)) for term in terms if term}
+        
+        heads = {}
+        for key in self.keys:
+            heads.setdefault(self.RUNS.match(key).group(), []).append(key)
+        self.heads = {head: tuple(sorted(keys, key=len, reverse=True)) for head, keys in heads.items()}
+        
+        # Shorter terms that also match wherever a longer term matches,
+        # e.g. 'dividend' inside 'dividend yield'
+        self.prefixes = {}
+        for key in self.keys:
+            prefixes = self._boundary_prefixes(key)
+            if prefixes:
+                self.prefixes[key] = prefixes
+    
+    def _is_word(self, text, i):
+        return 0 <= i < len(text) and self.WORD_CHAR.match(text[i]) is not None
+    
+    def _boundary_prefixes(self, key):
+        """Find the other terms that are prefixes of key ending on a word boundary"""
+        # Word boundaries inside key are where its runs end
+        ends = [run.end() for run in self.RUNS.finditer(key)][:-1]
+        return [key[:end] for end in ends if key[:end] in self.keys]
+    
+    def scan(self, text):
+        """Yield (start, end, key) for the longest term starting at each word boundary"""
+        folded = fold(text)
+        heads = self.heads
+        for run in self.RUNS.finditer(folded):
+            keys = heads.get(run.group())
+            if keys is None:
+                continue
+            start = run.start()
+            # Every run starts on a word boundary, except non-word text at the very start
+            if start == 0 and not self._is_word(folded, 0):
+                continue
+            for key in keys:
+                end = start + len(key)
+                if folded.startswith(key, start) and self._is_word(folded, end - 1) != self._is_word(folded, end):
+                    yield start, end, key
+                    break
+    
+    def longest(self, matches):
+        """Keep the non-overlapping longest matches from scan(), left to right"""
+        position = 0
+        for start, end, key in matches:
+            if start >= position:
+                yield start, end, key
+                position = end
+    
+    def count(self, matches):
+        """Count the non-overlapping occurrences of every term from scan()"""
+        counts = {}
+        next_start = {}
+        for start, _, key in matches:
+            for hit in self.prefixes.get(key, []) + [key]:
+                if start < next_start.get(hit, 0):
+                    continue
+                counts[hit] = counts.get(hit, 0) + 1
+                next_start[hit] = start + len(hit)
+        return counts
+
+class Glossary:
+    """A compiled glossary: matchers for its terms and the replacement for each match"""
+    
+    def __init__(self, jargon, phrases, version):
+        self.version = version
+        # Lowercase key -> (term as written, explanation, position in the file)
+        self.jargon = {}
+        for term, explanation in jargon:
+            key = sys.intern(fold(term))
+            self.jargon.pop(key, None)
+            self.jargon[key] = (term, explanation, len(self.jargon))
+        self.phrases = {sys.intern(fold(phrase)): (phrase, replacement) for phrase, replacement in phrases}
+        
+        self.jargon_matcher = TermMatcher(self.jargon)
+        self.rewrite_matcher = TermMatcher([*self.jargon, *self.phrases])
+    
+    def __len__(self):
+        return len(self.jargon.keys() | self.phrases.keys())
+    
+    def replacement(self, key, level):
+        """(original, replacement) for a rewrite_matcher key at a simplification level"""
+        # Jargon takes precedence over a phrase with the same spelling
+        entry = self.jargon.get(key)
+        if entry is None:
+            return self.phrases[key]
+        
+        term, explanation, _ = entry
+        if level == 'expert':
+            return term, f"{term} ({explanation})"
+        elif level == 'detailed':
+            return term, f"{explanation} ({term})"
+        else:  # basic
+            return term, explanation
+    
+    def jargon_list(self, counts):
+        """Turn per-term counts into the detected jargon list, most frequent first"""
+        hits = sorted((key for key in counts if key in self.jargon), key=lambda key: (-counts[key], self.jargon[key][2]))
+        return [
+            {'term': self.jargon[key][0], 'explanation': self.jargon[key][1], 'count': counts[key]}
+            for key in hits
+        ]
+
+def read_glossary(path):
+    """(jargon, phrases) lists of (term, text) pairs from a glossary file"""
+    extension = os.path.splitext(path)[1]
+    if extension == '.json':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return list(data.get('jargon', {}).items()), list(data.get('phrases', {}).items())
+    
+    if extension == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = [(row['kind'], row['term'], row['text']) for row in csv.DictReader(f)]
+    elif extension == '.sqlite':
+        db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            rows = db.execute('SELECT kind, term, text FROM terms ORDER BY rowid').fetchall()
+        finally:
+            db.close()
+    else:
+        raise ValueError(f"Unsupported glossary format: {path}")
+    
+    jargon = [(term, text) for kind, term, text in rows if kind == 'jargon']
+    phrases = [(term, text) for kind, term, text in rows if kind == 'phrase']
+    return jargon, phrases
+
+def file_version(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+class GlossaryStore:
+    """Glossaries by (locale, domain) from a directory, recompiled in the background when their file changes"""
+    
+    EXTENSIONS = ('.json', '.csv', '.sqlite')
+    NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+    
+    def __init__(self, directory, default_locale, default_domain, check_interval=5, cache_size=8):
+        self.directory = directory
+        self.default_locale = default_locale
+        self.default_domain = default_domain
+        self.check_interval = check_interval
+        self.cache_size = cache_size
+        self.loaded = {}  # (locale, domain) -> (file signature, Glossary)
+        self.checked = {}  # (locale, domain) -> when the file was last looked at
+        self.compiled = OrderedDict()  # version -> Glossary
+        self.lock = threading.Lock()
+    
+    def get(self, locale=None, domain=None):
+        """The current glossary for locale and domain (defaults when not given)"""
+        selection = (locale or self.default_locale, domain or self.default_domain)
+        entry = self.loaded.get(selection)
+        if entry is not None and time.monotonic() - self.checked[selection] < self.check_interval:
+            return entry[1]
+        
+        if entry is None:
+            with self.lock:
+                entry = self.loaded.get(selection)
+                if entry is None:
+                    path, signature = self._signature(selection)
+                    return self._load(selection, path, signature)
+            return entry[1]
+        
+        # One request looks at the file; a changed one is compiled in the
+        # background while requests keep the glossary they have
+        if not self.lock.acquire(blocking=False):
+            return entry[1]
+        self.checked[selection] = time.monotonic()
+        try:
+            path, signature = self._signature(selection)
+        except (GlossaryNotFound, OSError) as e:
+            logger.error(f"Glossary check error ({selection[0]}/{selection[1]}): {str(e)}")
+            self.lock.release()
+            return entry[1]
+        
+        if signature == entry[0]:
+            self.lock.release()
+        else:
+            threading.Thread(target=self._reload, args=(selection, path, signature), daemon=True).start()
+        return entry[1]
+    
+    def _path(self, locale, domain):
+        if self.NAME.match(locale) and self.NAME.match(domain):
+            for extension in self.EXTENSIONS:
+                path = os.path.join(self.directory, locale, domain + extension)
+                if os.path.exists(path):
+                    return path
+        raise GlossaryNotFound(f"No glossary for locale '{locale}' and domain '{domain}'")
+    
+    def _signature(self, selection):
+        path = self._path(*selection)
+        stat = os.stat(path)
+        return path, (path, stat.st_mtime_ns, stat.st_size)
+    
+    def _load(self, selection, path, signature):
+        self.checked[selection] = time.monotonic()
+        glossary = self._compile(path)
+        self.loaded[selection] = (signature, glossary)
+        return glossary
+    
+    def _reload(self, selection, path, signature):
+        old = self.loaded[selection][1]
+        try:
+            glossary = self._load(selection, path, signature)
+        except Exception as e:
+            # The old glossary stays until the file loads again
+            logger.error(f"Glossary load error ({path}): {str(e)}")
+            return
+        finally:
+            self.lock.release()
+        
+        if glossary.version != old.version:
+            logger.info(f"Glossary {selection[0]}/{selection[1]} reloaded: version {glossary.version}, {len(glossary)} terms")
+    
+    def _compile(self, path):
+        version = file_version(path)
+        glossary = self.compiled.get(version)
+        if glossary is None:
+            glossary = Glossary(*read_glossary(path), version)
+            self.compiled[version] = glossary
+            while len(self.compiled) > self.cache_size:
+                self.compiled.popitem(last=False)
+        self.compiled.move_to_end(version)
+        return glossary
+    
+    def available(self):
+        """(locale, domain) pairs that have a glossary file"""
+        found = set()
+        for locale in sorted(os.listdir(self.directory)):
+            locale_dir = os.path.join(self.directory, locale)
+            if not os.path.isdir(locale_dir):
+                continue
+            for name in os.listdir(locale_dir):
+                domain, extension = os.path.splitext(name)
+                if extension in self.EXTENSIONS:
+                    found.add((locale, domain))
+        return sorted(found)
@@ -0,0 +1,34 @@
+"""Gunicorn settings, loaded automatically when gunicorn starts in this directory
+
+SERVING_MODE=async runs gevent workers. Network waits in NewsAPI calls,
+topic-page scrapes and article downloads then yield to other requests
+instead of blocking the worker, and CPU-heavy simplification goes to a
+native thread pool (see run_cpu_bound in app.py). One process can then hold
+hundreds of in-flight searches while /api/trending-topics stays fast.
+The default, SERVING_MODE=sync, keeps gunicorn's standard sync workers.
+
+The app is loaded once in the master and warmed up there (glossary,
+hyphenation dictionary, bs4/lxml/numpy), then the workers are forked from
+it: they start without importing anything and share those pages
+copy-on-write. Startup never touches the network. PRELOAD_APP=0 loads the
+app in each worker instead.
+"""
+import gc
+import os
+
+preload_app = os.environ.get('PRELOAD_APP', '1') == '1'
+
+if os.environ.get('SERVING_MODE') == 'async':
+    worker_class = 'gevent'
+    worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 500))
+    if preload_app:
+        # The app's locks and sockets must be created gevent-aware, so patch before it is imported
+        from gevent import monkey
+        monkey.patch_all()
+
+def when_ready(server):
+    if preload_app:
+        import app
+        app.warm_up()
+        # Keep the collector from touching (and so copying) the master's objects in every worker
+        gc.freeze()
@@ -86,17 +86,6 @@ else
 fi
 echo ""
 
-# Download NLTK data
-echo "Downloading NLTK data..."
-python -m nltk.downloader punkt stopwords
-
-if [ $? -eq 0 ]; then
-    echo "✅ NLTK data downloaded"
-else
-    echo "⚠️  NLTK data download failed (you may need to run this manually)"
-fi
-echo ""
-
 # Run compatibility check
 echo "Running compatibility check..."
 python check_compatibility.py
@@ -7,6 +7,15 @@ let currentSimplificationLevel = 'basic';
 let isSearching = false;
 let currentSearchQuery = '';
 
+// Compact responses: only the fields the page shows, simplified text as spans over the original
+const ARTICLE_FIELDS = [
+    'original.title', 'original.source', 'original.publishedAt', 'original.url', 'original.content',
+    'simplified.content',
+    'analysis.complexity', 'analysis.jargon_count', 'analysis.readability_score',
+    'analysis.jargon_detected', 'analysis.insights'
+];
+const TEXT_FIELDS = ['complexity', 'jargon_count', 'readability_score', 'jargon_detected', 'insights', 'simplified_text'];
+
 // DOM Elements
 const elements = {
     newsSearchInput: null,
@@ -141,9 +150,7 @@ async function searchNews() {
     showLoadingOverlay(true, 'Fetching Latest News...', 'Searching financial news sources and analyzing content...');
     
     try {
-        // Simulate progress
-        await simulateSearchProgress();
-        
+        // Articles are streamed one per line (NDJSON) as soon as each is simplified
         const response = await fetch(`${API_BASE_URL}/api/search-news`, {
             method: 'POST',
             headers: {
@@ -151,22 +158,49 @@ async function searchNews() {
             },
             body: JSON.stringify({
                 query: query,
-                level: currentSimplificationLevel
+                level: currentSimplificationLevel,
+                stream: true,
+                format: 'compact',
+                fields: ARTICLE_FIELDS
             })
         });
         
+        if (showBusyToast(response)) {
+            displayNoResults();
+            return;
+        }
+        
         if (!response.ok) {
             throw new Error('Failed to fetch news');
         }
         
-        const data = await response.json();
+        startNewsResults();
+        let articleCount = 0;
+        let summary = null;
         
-        if (data.error) {
-            throw new Error(data.error);
+        await readNdjson(response, frame => {
+            if (frame.type === 'article') {
+                // Show the page as soon as the first article arrives
+                if (articleCount === 0) showLoadingOverlay(false);
+                appendArticle(expandArticle(frame.article), articleCount++);
+            } else if (frame.type === 'summary') {
+                summary = frame;
+            } else if (frame.type === 'error') {
+                throw new Error(frame.error);
+            }
+        });
+        
+        if (!summary) {
+            throw new Error('Incomplete response');
         }
         
-        displayNewsResults(data);
-        showToast(`Found ${data.total_found} articles`, 'success');
+        finishNewsResults(summary);
+        if (summary.degraded) {
+            const shown = summary.degraded === 'stale' ? 'earlier results' : 'headlines only';
+            showToast(`The service is busy, showing ${shown} for now`, 'info');
+        } else {
+            showToast(`Found ${summary.total_found || 0} articles`, 'success');
+        }
         
     } catch (error) {
         console.error('Search error:', error);
@@ -178,82 +212,122 @@ async function searchNews() {
     }
 }
 
-// Search Trending Topic
-function searchTrendingTopic(topic) {
-    elements.newsSearchInput.value = topic;
-    searchNews();
+// Tell the user to wait when the server is rate limiting them or shedding load; true if it did
+function showBusyToast(response) {
+    if (response.status !== 429 && response.status !== 503) return false;
+    
+    const retryAfter = parseInt(response.headers.get('Retry-After'), 10) || 5;
+    const reason = response.status === 429 ? 'Too many requests' : 'The service is busy';
+    showToast(`${reason}, please try again in ${retryAfter} seconds`, 'error');
+    return true;
 }
 
-// Simulate Search Progress
-function simulateSearchProgress() {
-    return new Promise((resolve) => {
-        let progress = 0;
-        const progressFill = document.getElementById('progressFill');
-        const progressText = document.getElementById('progressText');
-        const loadingDescription = document.getElementById('loadingDescription');
-        
-        const steps = [
-            { progress: 25, message: 'Searching news sources...' },
-            { progress: 50, message: 'Analyzing financial content...' },
-            { progress: 75, message: 'Simplifying complex terms...' },
-            { progress: 100, message: 'Finalizing results...' }
-        ];
+// Read an NDJSON response body, calling onFrame for every complete line
+async function readNdjson(response, onFrame) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
         
-        let stepIndex = 0;
-        
-        const interval = setInterval(() => {
-            if (stepIndex < steps.length) {
-                const step = steps[stepIndex];
-                progress = step.progress;
-                
-                if (progressFill) progressFill.style.width = `${progress}%`;
-                if (progressText) progressText.textContent = `${progress}%`;
-                if (loadingDescription) loadingDescription.textContent = step.message;
-                
-                stepIndex++;
-            }
-            
-            if (progress >= 100) {
-                clearInterval(interval);
-                setTimeout(resolve, 500);
-            }
-        }, 800);
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => onFrame(JSON.parse(line)));
+    }
+    
+    buffer += decoder.decode();
+    if (buffer.trim()) onFrame(JSON.parse(buffer));
+}
+
+// Rebuild text from [start, end, i] spans replaced by texts[i]; offsets count code points, as in Python
+function applySpans(text, spans, texts) {
+    const chars = Array.from(text);
+    const slice = chars.length === text.length
+        ? (start, end) => text.slice(start, end)
+        : (start, end) => chars.slice(start, end).join('');
+    
+    const pieces = [];
+    let position = 0;
+    spans.forEach(([start, end, i]) => {
+        pieces.push(slice(position, start), texts[i]);
+        position = end;
     });
+    pieces.push(slice(position, chars.length));
+    return pieces.join('');
+}
+
+// Turn a compact article back into the full shape the page renders
+function expandArticle(article) {
+    const simplified = article.simplified;
+    if (simplified && simplified.spans) {
+        simplified.content = applySpans(article.original.content, simplified.spans, simplified.texts);
+        delete simplified.spans;
+        delete simplified.texts;
+    }
+    return article;
+}
+
+// Search Trending Topic
+function searchTrendingTopic(topic) {
+    elements.newsSearchInput.value = topic;
+    searchNews();
 }
 
 // Display News Results
 function displayNewsResults(data) {
+    startNewsResults();
+    data.articles.forEach((article, index) => appendArticle(article, index));
+    finishNewsResults(data);
+}
+
+// Show an empty results section, ready for articles to be appended
+function startNewsResults() {
     if (!elements.newsResults || !elements.articlesContainer) return;
     
     // Show results section
     elements.newsResults.style.display = 'block';
     
-    // Update results count
     document.getElementById('resultsTitle').textContent = `Results for "${currentSearchQuery}"`;
     if (elements.resultsCount) {
-        elements.resultsCount.textContent = `${data.total_found} articles found`;
+        elements.resultsCount.textContent = 'Loading articles...';
     }
     
     // Clear previous results
     elements.articlesContainer.innerHTML = '';
     
-    if (data.articles.length === 0) {
-        displayNoResults();
-        return;
-    }
-    
-    // Display articles
-    data.articles.forEach((article, index) => {
-        const articleElement = createArticleElement(article, index);
-        elements.articlesContainer.appendChild(articleElement);
-    });
-    
     // Scroll to results
     setTimeout(() => {
         elements.newsResults.scrollIntoView({ behavior: 'smooth', block: 'start' });
     }, 100);
 }
 
+// Append one article card as it arrives
+function appendArticle(article, index) {
+    if (!elements.articlesContainer) return;
+    
+    const articleElement = createArticleElement(article, index);
+    elements.articlesContainer.appendChild(articleElement);
+    
+    if (elements.resultsCount) {
+        elements.resultsCount.textContent = `${index + 1} articles so far...`;
+    }
+}
+
+// Update the results count once every article has arrived
+function finishNewsResults(summary) {
+    if (!summary.total_found) {
+        displayNoResults();
+        return;
+    }
+    
+    if (elements.resultsCount) {
+        elements.resultsCount.textContent = `${summary.total_found} articles found`;
+    }
+}
+
 // Create Article Element
 function createArticleElement(article, index) {
     const div = document.createElement('div');
@@ -344,10 +418,14 @@ async function simplifyCustomText() {
             },
             body: JSON.stringify({
                 text: text,
-                level: currentSimplificationLevel
+                level: currentSimplificationLevel,
+                format: 'compact',
+                fields: TEXT_FIELDS
             })
         });
         
+        if (showBusyToast(response)) return;
+        
         if (!response.ok) {
             throw new Error('Failed to simplify text');
         }
@@ -358,6 +436,12 @@ async function simplifyCustomText() {
             throw new Error(data.error);
         }
         
+        // The compact format does not echo the text back
+        data.original_text = text;
+        if (data.simplified_spans) {
+            data.simplified_text = applySpans(text, data.simplified_spans, data.simplified_texts);
+        }
+        
         displayCustomTextResults(data);
         showToast('Text simplified successfully!', 'success');
         
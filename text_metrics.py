@@ -0,0 +1,190 @@
+"""Word, sentence and syllable counts for the complexity and readability scores
+
+measure() splits a text into whitespace tokens and into sentence pieces
+once, then works out each token's length, word count and syllable count from
+a bounded memo. Financial vocabulary repeats a lot, so most tokens are memo
+hits and pyphen is only consulted for new words.
+
+flesch_reading_ease() applies textstat's formula to these counts. Tokens,
+punctuation removal, sentence rules and rounding are the ones textstat 0.7.3
+uses for en_US, so the 0-100 score is the same as
+round(textstat.flesch_reading_ease(text)) clamped to 0-100. Tolerance is 0
+points for textstat 0.7.3 (checked by benchmarks/bench_metrics.py). Other
+textstat releases changed their own rules and can differ by a point or two.
+
+apply_edits() turns the counts of a text into the counts of the same text
+with some spans replaced. Only the tokens and sentences that touch an edit
+are counted again, so scoring the simplified text does not rescan it.
+"""
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+
+SYLLABLE_MEMO_SIZE = 65536  # Distinct tokens remembered
+DENSE_EDIT_CHARS = 200  # With an edit every this many characters or more often, re-measuring is faster
+
+# textstat 0.7.3 defaults: en_US hyphenation and the English Flesch constants
+FRE_BASE = 206.835
+FRE_SENTENCE_LENGTH = 1.015
+FRE_SYLLABLES_PER_WORD = 84.6
+
+PUNCTUATION = re.compile(r'[^\w\s]')
+SENTENCE_END = re.compile(r'[.!?]+')
+
+COUNT_KEYS = ('word_count', 'word_chars', 'sentence_count', 'lexicon_count', 'syllable_count', 'fre_sentence_count')
+
+@lru_cache(maxsize=None)
+def hyphenator():
+    """The en_US hyphenation dictionary, loaded on first use"""
+    from pyphen import Pyphen
+    return Pyphen(lang='en_US')
+
+@lru_cache(maxsize=SYLLABLE_MEMO_SIZE)
+def token_counts(token):
+    """(words, syllables) textstat counts for one whitespace-free token"""
+    word = PUNCTUATION.sub('', token.lower())
+    if not word:
+        return 0, 0
+    return 1, len(hyphenator().positions(word)) + 1
+
+def count_tokens(text, counts):
+    """Add the token counts of text to counts"""
+    tokens = text.split()
+    lexicon = 0
+    syllables = 0
+    # Repeated tokens are looked up once
+    for token, n in Counter(tokens).items():
+        token_words, token_syllables = token_counts(token)
+        lexicon += n * token_words
+        syllables += n * token_syllables
+    
+    counts['word_count'] += len(tokens)
+    counts['word_chars'] += sum(map(len, tokens))
+    counts['lexicon_count'] += lexicon
+    counts['syllable_count'] += syllables
+
+def count_sentences(text, counts):
+    """Add the sentence counts of text to counts: non-blank pieces, and textstat's pieces of more than two words"""
+    sentences = 0
+    fre_sentences = 0
+    for piece in SENTENCE_END.split(text):
+        # Three words settle it, so only the rest of a long piece stays unsplit
+        head = piece.split(None, 3)
+        if not head:
+            continue
+        sentences += 1
+        words = sum(token_counts(token)[0] for token in head[:3])
+        if words < 3 and len(head) == 4:
+            words += sum(token_counts(token)[0] for token in head[3].split())
+        if words > 2:
+            fre_sentences += 1
+    
+    counts['sentence_count'] += sentences
+    counts['fre_sentence_count'] += fre_sentences
+
+def empty_counts():
+    return dict.fromkeys(COUNT_KEYS, 0)
+
+def measure(text):
+    """All counts for text"""
+    counts = empty_counts()
+    count_tokens(text, counts)
+    count_sentences(text, counts)
+    return counts
+
+def _token_bounds(text, start, end):
+    """Widen [start, end) to whole whitespace-separated tokens"""
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return start, end
+
+def _sentence_bounds(text, start, end):
+    """Widen [start, end) to whole pieces between sentence endings"""
+    start = max(text.rfind(char, 0, start) for char in '.!?') + 1
+    match = SENTENCE_END.search(text, end)
+    return start, match.start() if match else len(text)
+
+def _regions(text, edits, bounds):
+    """Group edits into widened, non-overlapping regions with the region's old and new text"""
+    regions = []
+    for start, end, replacement in edits:
+        region_start, region_end = bounds(text, start, end)
+        if regions and region_start < regions[-1][1]:
+            regions[-1][1] = max(regions[-1][1], region_end)
+            regions[-1][2].append((start, end, replacement))
+        else:
+            regions.append([region_start, region_end, [(start, end, replacement)]])
+    
+    for region_start, region_end, region_edits in regions:
+        pieces = []
+        position = region_start
+        for start, end, replacement in region_edits:
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(text[position:region_end])
+        yield text[region_start:region_end], ''.join(pieces)
+
+def _replace_counts(counts, text, edits, bounds, counter, separator):
+    """Swap the counts of the regions around edits for the counts of their new text"""
+    old_regions = []
+    new_regions = []
+    for old, new in _regions(text, edits, bounds):
+        old_regions.append(old)
+        new_regions.append(new)
+    
+    old_counts = empty_counts()
+    counter(separator.join(old_regions), old_counts)
+    new_counts = empty_counts()
+    counter(separator.join(new_regions), new_counts)
+    for key in COUNT_KEYS:
+        counts[key] += new_counts[key] - old_counts[key]
+
+def apply_edits(counts, text, edits):
+    """Counts of text after replacing each (start, end, replacement) in sorted, non-overlapping edits; counts is measure(text)"""
+    # Changed sentence endings re-split the text, and dense edits cover most of it anyway
+    if len(edits) * DENSE_EDIT_CHARS > len(text) or any(
+        SENTENCE_END.search(replacement) or SENTENCE_END.search(text, start, end) for start, end, replacement in edits
+    ):
+        pieces = []
+        position = 0
+        for start, end, replacement in edits:
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(text[position:])
+        return measure(''.join(pieces))
+    
+    counts = dict(counts)
+    _replace_counts(counts, text, edits, _token_bounds, count_tokens, ' ')
+    _replace_counts(counts, text, edits, _sentence_bounds, count_sentences, '.')
+    return counts
+
+def _legacy_round(number, points=0):
+    # textstat's rounding: half away from zero
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+def flesch_reading_ease(counts):
+    """textstat's Flesch Reading Ease from measure() counts"""
+    words = counts['lexicon_count']
+    sentence_length = _legacy_round(words / max(1, counts['fre_sentence_count']), 1)
+    syllables_per_word = _legacy_round(counts['syllable_count'] / words, 1) if words else 0.0
+    return _legacy_round(FRE_BASE - FRE_SENTENCE_LENGTH * sentence_length - FRE_SYLLABLES_PER_WORD * syllables_per_word, 2)
+
+def _legacy_round_array(numbers, points=0):
+    import numpy as np
+    p = 10 ** points
+    return np.floor(numbers * p + np.copysign(0.5, numbers)) / p
+
+def flesch_reading_ease_array(counts):
+    """flesch_reading_ease() over arrays of counts, one element per text"""
+    import numpy as np
+    words = counts['lexicon_count'].astype(np.float64)
+    has_words = words > 0
+    sentence_length = _legacy_round_array(words / np.maximum(1, counts['fre_sentence_count']), 1)
+    syllables_per_word = np.where(has_words, _legacy_round_array(counts['syllable_count'] / np.where(has_words, words, 1), 1), 0.0)
+    return _legacy_round_array(FRE_BASE - FRE_SENTENCE_LENGTH * sentence_length - FRE_SYLLABLES_PER_WORD * syllables_per_word, 2)